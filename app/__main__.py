@@ -22,7 +22,10 @@ def run():
     container.init_resources()
     container.wire(modules=[__name__])
 
-    main()
+    try:
+        main()
+    finally:
+        container.shutdown_resources()
 
 
 if __name__ == "__main__":
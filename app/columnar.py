@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+from typing import Iterable, List
+
+import numpy as np
+
+# Missing integer values, missing coordinates are NaN
+MISSING = -1
+
+CONNECTION_DTYPE = np.dtype(
+    [
+        ("from_id", "U24"),
+        ("to_id", "U24"),
+        ("from_lat", "f8"),
+        ("from_lon", "f8"),
+        ("to_lat", "f8"),
+        ("to_lon", "f8"),
+        ("departure", "i8"),
+        ("arrival", "i8"),
+        ("duration", "i8"),
+        ("transfers", "i2"),
+    ]
+)
+
+
+def number(value, missing=MISSING):
+    return missing if value is None else value
+
+
+class ConnectionTable:
+    """Connections as a NumPy structured array, one row per connection
+
+    Times are epoch seconds and durations seconds, coordinates are the
+    latitude (x) and longitude (y) of the departure and arrival station.
+    Columns are read with table["duration"], filters and sorts return new tables.
+    """
+
+    def __init__(self, rows: np.ndarray = None) -> None:
+        self.rows = np.empty(0, CONNECTION_DTYPE) if rows is None else rows
+
+    @classmethod
+    def from_records(cls, records: List[tuple]) -> "ConnectionTable":
+        return cls(np.array(records, dtype=CONNECTION_DTYPE))
+
+    @classmethod
+    def from_connections(cls, connections: Iterable) -> "ConnectionTable":
+        """Builds a table from Connection models, e.g. results of the cache service"""
+        records = []
+        for connection in connections:
+            departure, arrival = connection._from, connection.to
+            records.append(
+                (
+                    departure.station.id or "",
+                    arrival.station.id or "",
+                    number(departure.station.coordinate.x, np.nan),
+                    number(departure.station.coordinate.y, np.nan),
+                    number(arrival.station.coordinate.x, np.nan),
+                    number(arrival.station.coordinate.y, np.nan),
+                    number(departure.departureTimestamp),
+                    number(arrival.arrivalTimestamp),
+                    number(connection.duration_seconds),
+                    number(connection.transfers),
+                )
+            )
+        return cls.from_records(records)
+
+    @classmethod
+    def concatenate(cls, tables: Iterable["ConnectionTable"]) -> "ConnectionTable":
+        rows = [table.rows for table in tables]
+        if not rows:
+            return cls()
+        return cls(np.concatenate(rows))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.rows[key]
+        return ConnectionTable(np.atleast_1d(self.rows[key]))
+
+    def __repr__(self) -> str:
+        return f"ConnectionTable({len(self)} connections)"
+
+    def filter(self, mask: np.ndarray) -> "ConnectionTable":
+        return ConnectionTable(self.rows[mask])
+
+    def sort(self, *columns: str, descending=False) -> "ConnectionTable":
+        """Stable sort by one or more columns, the first one is the primary key"""
+        order = np.lexsort([self.rows[column] for column in reversed(columns)])
+        if descending:
+            order = order[::-1]
+        return ConnectionTable(self.rows[order])
+
+    def departing_between(self, start: int, end: int) -> "ConnectionTable":
+        departure = self.rows["departure"]
+        return self.filter((departure >= start) & (departure <= end))
+
+    def with_arrival_coordinates(self) -> "ConnectionTable":
+        return self.filter(
+            ~(np.isnan(self.rows["to_lat"]) | np.isnan(self.rows["to_lon"]))
+        )
+
+    def arrival_coordinates(self) -> np.ndarray:
+        """(n, 2) array of the arrival station latitudes and longitudes"""
+        return np.column_stack((self.rows["to_lat"], self.rows["to_lon"]))
+
+    def stats(self) -> dict:
+        duration = self.rows["duration"]
+        duration = duration[duration != MISSING]
+        transfers = self.rows["transfers"]
+        transfers = transfers[transfers != MISSING]
+        return {
+            "connections": len(self),
+            "min_duration": int(duration.min()) if len(duration) else None,
+            "median_duration": float(np.median(duration)) if len(duration) else None,
+            "max_transfers": int(transfers.max()) if len(transfers) else None,
+            "mean_transfers": float(transfers.mean()) if len(transfers) else None,
+        }
@@ -8,7 +8,7 @@ from dependency_injector import containers, providers
 import logging.config
 from geopy.geocoders import Nominatim
 
-from . import services, tui
+from . import services, tui, utils, http, store, ratelimit, recording, interning
 
 
 class Container(containers.DeclarativeContainer):
@@ -18,20 +18,132 @@ class Container(containers.DeclarativeContainer):
         fname="logging.ini",
     )
 
+    # Record or replay all requests, see [recording] in config.ini
+    recording_corpus = providers.Singleton(
+        recording.RecordingCorpus, path=config.recording.corpus
+    )
+
     # Geolocator
-    geolocator = providers.Singleton(Nominatim, user_agent="tbz_transport_app")
+    nominatim = providers.Singleton(Nominatim, user_agent="tbz_transport_app")
+    geolocator = providers.Selector(
+        config.recording.mode.as_(utils.choice_key),
+        off=nominatim,
+        record=providers.Singleton(
+            recording.RecordingGeolocator,
+            geolocator=nominatim,
+            corpus=recording_corpus,
+        ),
+        replay=providers.Singleton(
+            recording.ReplayGeolocator,
+            corpus=recording_corpus,
+            latency=config.recording.latency,
+        ),
+    )
+
+    # HTTP connection pool shared by all services
+    http_session = providers.Resource(
+        http.init_session,
+        pool_connections=config.http.pool_connections.as_int(),
+        pool_maxsize=config.http.pool_maxsize.as_int(),
+        connect_timeout=config.http.connect_timeout.as_float(),
+        read_timeout=config.http.read_timeout.as_float(),
+        max_retries=config.http.max_retries.as_int(),
+        keep_alive=config.http.keep_alive.as_(utils.parse_bool),
+    )
+    session = providers.Selector(
+        config.recording.mode.as_(utils.choice_key),
+        off=http_session,
+        record=providers.Singleton(
+            recording.RecordingSession,
+            session=http_session,
+            corpus=recording_corpus,
+        ),
+        replay=providers.Singleton(
+            recording.ReplaySession,
+            corpus=recording_corpus,
+            latency=config.recording.latency,
+        ),
+    )
+
+    # Shared by the sync and async transport services
+    rate_limiter = providers.Singleton(
+        ratelimit.AdaptiveRateLimiter,
+        rate=config.transport.rate,
+        burst=config.transport.burst,
+        initial_concurrency=config.transport.concurrency,
+        min_concurrency=config.transport.min_concurrency,
+        max_concurrency=config.transport.max_concurrency,
+        slow_threshold=config.transport.slow_threshold,
+    )
+    station_registry = providers.Singleton(
+        interning.InternRegistry,
+        max_entries=config.transport.interned_stations,
+    )
 
     # Services
     transport_service = providers.Singleton(
-        services.TransportService, url=config.transport.url
+        services.TransportService,
+        url=config.transport.url,
+        session=session,
+        limiter=rate_limiter,
+        stations=station_registry,
+    )
+    async_transport_service = providers.Singleton(
+        services.AsyncTransportService,
+        url=config.transport.url,
+        session=session,
+        concurrency=config.transport.max_concurrency,
+        pool_size=config.http.pool_maxsize,
+        connect_timeout=config.http.connect_timeout,
+        read_timeout=config.http.read_timeout,
+        limiter=rate_limiter,
+        stations=station_registry,
     )
     location_autocomplet_service = providers.Singleton(
-        services.LocationAutocompletService, url=config.search.url
+        services.LocationAutocompletService,
+        url=config.search.url,
+        session=session,
+    )
+    # Recording and replaying go through the session, so the aiohttp backend is
+    # replaced by the blocking service running in threads
+    async_transport_backend = providers.Selector(
+        config.recording.mode.as_(utils.choice_key),
+        off=async_transport_service,
+        record=transport_service,
+        replay=transport_service,
+    )
+    coalescing_transport_service = providers.Singleton(
+        services.CoalescingTransportService,
+        transport_service=transport_service,
+        async_transport_service=async_transport_backend,
+    )
+    location_cache = providers.Singleton(
+        store.PersistentCache,
+        path=config.data.location_cache,
+        max_entries=config.cache.location_max_entries,
+    )
+    connection_cache = providers.Selector(
+        config.cache.connection_persist.as_(utils.bool_key),
+        true=providers.Singleton(
+            store.PersistentCache,
+            path=config.data.connection_cache,
+            max_entries=config.cache.connection_max_entries,
+        ),
+        false=providers.Object(None),
     )
     cache_service = providers.Singleton(
         services.TransportCacheService,
-        transport_service=transport_service,
+        transport_service=coalescing_transport_service,
         path=config.data.blacklist_connections,
+        async_transport_service=coalescing_transport_service,
+        location_cache=location_cache,
+        location_ttl=config.cache.location_ttl,
+        location_empty_ttl=config.cache.location_empty_ttl,
+        coordinate_precision=config.cache.coordinate_precision,
+        connection_cache=connection_cache,
+        connection_now_ttl=config.cache.connection_now_ttl,
+        connection_future_ttl=config.cache.connection_future_ttl,
+        connection_max_entries=config.cache.connection_memory_entries,
     )
     key_station_service = providers.Singleton(
         services.KeyStationsService,
@@ -43,13 +155,65 @@ class Container(containers.DeclarativeContainer):
     foreign_providers_service = providers.Singleton(
         services.ForeignProvidersService, path=config.data.foreign_providers
     )
+    station_index_service = providers.Singleton(
+        services.StationIndexService,
+        path=config.data.station_index,
+        max_distance=config.router.station_index_distance,
+    )
+    country_index_service = providers.Singleton(
+        services.CountryIndexService, path=config.data.countries
+    )
+    country_cache_service = providers.Singleton(
+        services.CountryCacheService,
+        cache=providers.Singleton(
+            store.PersistentCache,
+            path=config.data.country_cache,
+            max_entries=config.cache.country_max_entries,
+        ),
+        country_index=country_index_service,
+        precision=config.cache.country_precision,
+        fine_precision=config.cache.country_fine_precision,
+        ttl=config.cache.country_ttl,
+    )
     routing_service = providers.Singleton(
         services.RoutingService,
-        geolocator=geolocator,
+        # Nominatim is only asked for coordinates outside of the bundled countries
+        geolocator=providers.Selector(
+            config.router.geocoder_fallback.as_(utils.bool_key),
+            true=geolocator,
+            false=providers.Object(None),
+        ),
         transport_service=cache_service,
         foreign_providers_service=foreign_providers_service,
         steps=config.router.steps,
         nearness=config.router.nearness,
+        sampling=config.router.sampling,
+        coarse_steps=config.router.coarse_steps,
+        resolution=config.router.resolution,
+        station_index=station_index_service,
+        country_index=country_index_service,
+        country_cache=country_cache_service,
+        probe_workers=config.router.probe_workers,
+        coverage_threshold=config.router.coverage_threshold,
+        probe_strategy=config.router.probe_strategy,
+        search_verify=config.router.search_verify,
+        speculative_sampling=config.router.speculative_sampling.as_(utils.parse_bool),
+        route_cache=providers.Selector(
+            config.cache.route_persist.as_(utils.bool_key),
+            true=providers.Singleton(
+                services.RouteCacheService,
+                cache=providers.Singleton(
+                    store.PersistentCache,
+                    path=config.data.route_cache,
+                    max_entries=config.cache.route_max_entries,
+                ),
+                transport_service=transport_service,
+                blacklist=cache_service,
+                foreign_providers=foreign_providers_service,
+                bucket_seconds=config.cache.route_bucket,
+            ),
+            false=providers.Object(None),
+        ),
     )
     cli_service = providers.Singleton(
         services.CLIService, routing_service=routing_service
@@ -61,4 +225,5 @@ class Container(containers.DeclarativeContainer):
         routing_service=routing_service,
         location_autocomplet_service=location_autocomplet_service,
         key_station_service=key_station_service,
+        async_transport_service=async_transport_service,
     )
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+# Builds the country boundaries used by CountryIndexService
+#
+#   pip install timezonefinder
+#   python -m app.countries ./data/countries.npz
+#
+# Country borders are taken from the time zone boundaries bundled with
+# timezonefinder (timezone-boundary-builder, based on OpenStreetMap). In Europe
+# every time zone lies within one country, zone.tab maps it to the country code.
+
+import argparse
+
+import numpy as np
+
+# Zones outside of Europe/* belonging to European countries
+EXTRA_ZONES = {
+    "Arctic/Longyearbyen",
+    "Atlantic/Azores",
+    "Atlantic/Canary",
+    "Atlantic/Faroe",
+    "Atlantic/Madeira",
+    "Asia/Famagusta",
+    "Asia/Nicosia",
+}
+
+
+def read_zone_countries(path: str) -> dict:
+    countries = {}
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.startswith("#"):
+                continue
+            code, _, zone = line.split("\t")[:3]
+            countries[zone.strip()] = code.lower()
+    return countries
+
+
+def simplify(points, tolerance: float) -> np.ndarray:
+    """Douglas-Peucker simplification of a ring, tolerance in degrees"""
+    points = np.asarray(points, dtype=float)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, direction = points[first], points[last] - points[first]
+        between = points[first + 1 : last] - start
+        length = np.hypot(*direction)
+        if length == 0:
+            distances = np.hypot(between[:, 0], between[:, 1])
+        else:
+            cross = direction[0] * between[:, 1] - direction[1] * between[:, 0]
+            distances = np.abs(cross) / length
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            middle = first + 1 + index
+            keep[middle] = True
+            stack += [(first, middle), (middle, last)]
+    return points[keep]
+
+
+def build(target: str, zone_tab: str, tolerance: float) -> int:
+    from timezonefinder import TimezoneFinder
+
+    zone_countries = read_zone_countries(zone_tab)
+    finder = TimezoneFinder()
+
+    rings = {}
+    for zone in finder.timezone_names:
+        if not zone.startswith("Europe/") and zone not in EXTRA_ZONES:
+            continue
+        code = zone_countries[zone]
+        # Polygons are a shell followed by its holes, all of them are rings
+        for polygon in finder.get_geometry(tz_name=zone, coords_as_pairs=True):
+            for ring in polygon:
+                ring = simplify(ring, tolerance)
+                if len(ring) >= 4:
+                    rings.setdefault(code, []).append(ring)
+
+    codes = sorted(rings)
+    coordinates, offsets, countries = [], [0], []
+    for index, code in enumerate(codes):
+        for ring in rings[code]:
+            # Stored as latitude, longitude like everywhere else
+            coordinates.append(ring[:, ::-1])
+            offsets.append(offsets[-1] + len(ring))
+            countries.append(index)
+
+    np.savez_compressed(
+        target,
+        codes=np.array(codes, dtype=str),
+        coordinates=np.concatenate(coordinates).astype(np.float32),
+        ring_offsets=np.array(offsets, dtype=np.int32),
+        ring_countries=np.array(countries, dtype=np.int16),
+    )
+    return len(codes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Builds the country boundaries")
+    parser.add_argument("target", help="file to write, e.g. ./data/countries.npz")
+    parser.add_argument("--zone-tab", default="/usr/share/zoneinfo/zone.tab")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.002,
+        help="simplification tolerance in degrees (0.002 is about 200m)",
+    )
+    args = parser.parse_args()
+    print(f"Built {build(args.target, args.zone_tab, args.tolerance)} countries")
+
+
+if __name__ == "__main__":
+    main()
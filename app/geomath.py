@@ -9,8 +9,10 @@ from haversine import haversine
 
 
 # Conversion from and to latlon coordinate using https://stackoverflow.com/a/55256861
+# Both accept a single coordinate or an array of coordinates, one per row
 def convert_to_cartesian(coord):
-    lat, lon = coord
+    coord = np.asarray(coord, dtype=float)
+    lat, lon = coord[..., 0], coord[..., 1]
 
     lat_rad = np.radians(lat)
     lon_rad = np.radians(lon)
@@ -19,11 +21,14 @@ def convert_to_cartesian(coord):
     y = np.cos(lat_rad) * np.sin(lon_rad)
     z = np.sin(lat_rad)
 
-    return x, y, z
+    if coord.ndim == 1:
+        return x, y, z
+    return np.stack((x, y, z), axis=-1)
 
 
 def convert_to_latlon(coord):
-    x, y, z = coord
+    coord = np.asarray(coord, dtype=float)
+    x, y, z = coord[..., 0], coord[..., 1], coord[..., 2]
 
     lat_rad = np.arcsin(z)
     lon_rad = np.arctan2(y, x)
@@ -31,34 +36,65 @@ def convert_to_latlon(coord):
     lat = np.degrees(lat_rad)
     lon = np.degrees(lon_rad)
 
-    return lat, lon
+    if coord.ndim == 1:
+        return lat, lon
+    return np.stack((lat, lon), axis=-1)
 
 
 def calculate_intermediate_coordinates(coord1, coord2, num_points):
-    x1, y1, z1 = convert_to_cartesian(coord1)
-    x2, y2, z2 = convert_to_cartesian(coord2)
+    """Evenly spaced points on the great circle between two coordinates
 
-    dx = x2 - x1
-    dy = y2 - y1
-    dz = z2 - z1
+    Returns a (num_points, 2) array of latitudes and longitudes, the coordinates
+    themselves are not included.
+    """
+    fractions = np.arange(1, num_points + 1) / (num_points + 1)
+    return interpolate_great_circle(coord1, coord2, fractions)
 
-    increment_x = dx / (num_points + 1)
-    increment_y = dy / (num_points + 1)
-    increment_z = dz / (num_points + 1)
 
-    intermediate_coordinates = []
-    for i in range(num_points):
-        current_x = x1 + (increment_x * (i + 1))
-        current_y = y1 + (increment_y * (i + 1))
-        current_z = z1 + (increment_z * (i + 1))
+def interpolate_great_circle(coord1, coord2, fractions):
+    """Points at fractions (0 = coord1, 1 = coord2) of the great circle arc"""
+    start = np.asarray(convert_to_cartesian(coord1))
+    end = np.asarray(convert_to_cartesian(coord2))
+    fractions = np.asarray(fractions, dtype=float)
 
-        lat, lon = convert_to_latlon((current_x, current_y, current_z))
-        intermediate_coordinates.append((lat, lon))
+    # Spherical linear interpolation, the points stay on the surface of the sphere
+    angle = np.arccos(np.clip(np.dot(start, end), -1, 1))
+    if np.isclose(np.sin(angle), 0):
+        # Same (or opposite) coordinates have no unique great circle
+        points = np.outer(1 - fractions, start) + np.outer(fractions, end)
+    else:
+        points = (
+            np.outer(np.sin((1 - fractions) * angle), start)
+            + np.outer(np.sin(fractions * angle), end)
+        ) / np.sin(angle)
 
-    return intermediate_coordinates
+    return convert_to_latlon(points.reshape(-1, 3))
 
 
 def calculate_coverage_percentage(start_coord, end_coord, current_coord):
     total_distance = haversine(start_coord, end_coord)
     covered_distance = haversine(start_coord, current_coord)
     return covered_distance / total_distance
+
+
+# Mean earth radius as used by haversine
+EARTH_RADIUS = 6371.0088
+
+
+def calculate_distances(coord, coords):
+    """Haversine distances in km from one coordinate to an (n, 2) array of coordinates"""
+    lat, lon = np.radians(coord)
+    coords = np.radians(np.asarray(coords, dtype=float).reshape(-1, 2))
+    lats, lons = coords[:, 0], coords[:, 1]
+
+    d = (
+        np.sin((lats - lat) / 2) ** 2
+        + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(d))
+
+
+def calculate_coverage_percentages(start_coord, end_coord, coords):
+    """calculate_coverage_percentage for an (n, 2) array of current coordinates"""
+    total_distance = haversine(start_coord, end_coord)
+    return calculate_distances(start_coord, coords) / total_distance
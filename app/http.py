@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import logging
+from typing import Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter applying a default timeout to every request it sends"""
+
+    def __init__(self, timeout=None, **kwargs) -> None:
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    connect_timeout: float = 5,
+    read_timeout: float = 30,
+    max_retries: int = 0,
+    keep_alive: bool = True,
+) -> requests.Session:
+    adapter = TimeoutHTTPAdapter(
+        timeout=(connect_timeout, read_timeout),
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def init_session(**kwargs) -> Iterator[requests.Session]:
+    """Resource initializer used by the container, closes the pool on shutdown"""
+    session = create_session(**kwargs)
+    logger.debug("Opened HTTP session pool")
+    yield session
+    session.close()
+    logger.debug("Closed HTTP session pool")
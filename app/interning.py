@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import sys
+import threading
+import weakref
+
+
+def intern_string(value):
+    """sys.intern for values which may be None"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class InternRegistry:
+    """Hands out one shared instance per key as long as somebody uses it
+
+    Instances are only held weakly, so unused ones are released with the models
+    referencing them. At most `max_entries` instances are registered, further ones
+    are returned as they are. A registered instance is only shared for an equal
+    value, the API returns less fields for projected requests.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        self.max_entries = int(max_entries)
+        self.lock = threading.Lock()
+        self.instances = weakref.WeakValueDictionary()
+        self.hits = 0
+
+    def intern(self, key, value):
+        if key is None:
+            return value
+        with self.lock:
+            existing = self.instances.get(key)
+            if existing is not None and existing == value:
+                self.hits += 1
+                return existing
+            if existing is not None or len(self.instances) < self.max_entries:
+                self.instances[key] = value
+            return value
+
+    def __len__(self) -> int:
+        return len(self.instances)
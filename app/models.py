@@ -4,8 +4,83 @@
 __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
-from dataclasses import dataclass
-from typing import Optional, Any, List
+from collections.abc import Sequence
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Optional, Any, List, Callable
+
+
+class LazyList(Sequence):
+    """Read only list which parses its items from the raw API data on first access"""
+
+    __slots__ = ("data", "parse", "items")
+
+    def __init__(self, data: list, parse: Callable) -> None:
+        self.data = data
+        self.parse = parse
+        self.items = None
+
+    def materialize(self) -> list:
+        # Shared between threads, items is always set before data is dropped
+        items = self.items
+        if items is None:
+            data = self.data
+            if data is None:
+                # Parsed by another thread in the meantime
+                return self.items
+            items = [self.parse(item) for item in data]
+            self.items = items
+            # The raw data is not needed anymore
+            self.data = None
+        return items
+
+    def __getitem__(self, index):
+        return self.materialize()[index]
+
+    def __len__(self) -> int:
+        data = self.data
+        if data is None:
+            return len(self.items)
+        return len(data)
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, LazyList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.materialize())
+
+    def __reduce__(self):
+        # Copies and pickles are plain lists
+        return (list, (self.materialize(),))
+
+
+def fields_of(value) -> dict:
+    """Field values of a model, replaces **value.__dict__ for slotted dataclasses"""
+    if is_dataclass(value):
+        return {field.name: getattr(value, field.name) for field in fields(value)}
+    return dict(vars(value))
+
+
+def to_dict(value):
+    """Like dataclasses.asdict, but keeps unparsed LazyList data as it is"""
+    if isinstance(value, LazyList):
+        data = value.data
+        if data is not None:
+            return data
+        return [to_dict(item) for item in value.items]
+    if is_dataclass(value):
+        return {
+            field.name: to_dict(getattr(value, field.name)) for field in fields(value)
+        }
+    if isinstance(value, (list, tuple)):
+        return [to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_dict(item) for key, item in value.items()}
+    return value
 
 
 @dataclass
@@ -47,16 +122,21 @@ class RoutingConnectingStationsParams:
     nearness: int = 1000
     stop_at: int = 10
     only_nearest: bool = True
+    # "uniform" samples `steps` points, "adaptive" starts with `coarse_steps` points
+    # and bisects where stations or countries change down to `resolution` km
+    sampling: str = "uniform"
+    coarse_steps: int = 8
+    resolution: float = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class Coordinates:
     type: Optional[str]
     x: Optional[float]
     y: Optional[float]
 
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class Location:
     id: Optional[str]
     type: Optional[str]
@@ -66,7 +146,7 @@ class Location:
     distance: Optional[float]
 
 
-@dataclass
+@dataclass(slots=True)
 class Prognosis:
     platform: Optional[str]
     departure: Optional[str]
@@ -75,7 +155,7 @@ class Prognosis:
     capacity2nd: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Stop:
     station: Optional[Location]
     arrival: Optional[str]
@@ -83,9 +163,12 @@ class Stop:
     delay: Optional[int]
     platform: Optional[str]
     prognosis: Optional[Prognosis]
+    # Epoch seconds of arrival and departure
+    arrivalTimestamp: Optional[int] = None
+    departureTimestamp: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Journey:
     name: Optional[str]
     category: Optional[str]
@@ -98,7 +181,7 @@ class Journey:
     capacity2nd: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Section:
     journey: Optional[Journey]
     walk: Optional[str]
@@ -106,13 +189,13 @@ class Section:
     arrival: Optional[Stop]
 
 
-@dataclass
+@dataclass(slots=True)
 class Service:
     regular: Optional[str]
     irregular: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class Connection:
     _from: Optional[Stop]
     to: Optional[Stop]
@@ -123,17 +206,20 @@ class Connection:
     capacity1st: Optional[str]
     capacity2nd: Optional[str]
     sections: Optional[List[Section]]
+    duration_seconds: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteConnection(Connection):
     direct_connection: bool = True
     coverage: float = 1
     service_end_country: str = "CH"
     providers: Optional[List["RouteConnectionProvider"]] = None
+    # Field projection the connection was fetched with, None if it is complete
+    projection: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteConnectionProvider:
     name: str
     url: str
@@ -142,7 +228,7 @@ class RouteConnectionProvider:
     coverage: float
 
 
-@dataclass
+@dataclass(slots=True)
 class RouteLocation(Location):
     country: str
 
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket rate limit combined with an AIMD concurrency limit
+
+    The concurrency limit grows by one per window of successful requests and is
+    halved when a request is throttled (429), fails (5xx, network error) or is
+    slower than `slow_threshold` seconds. Usable from threads and coroutines.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5,
+        burst: int = 10,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        slow_threshold: float = 5,
+        backoff: float = 0.5,
+    ) -> None:
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_concurrency = int(min_concurrency)
+        self.max_concurrency = int(max_concurrency)
+        self.slow_threshold = float(slow_threshold)
+        self.backoff = float(backoff)
+
+        self.condition = threading.Condition()
+        self.tokens = self.burst
+        self.refilled = time.monotonic()
+        self.limit = float(initial_concurrency)
+        self.last_decrease = float("-inf")
+        self.in_flight = 0
+        self.waiting = 0
+
+    def try_acquire(self):
+        """Returns 0 when a slot was taken, else the seconds to wait (None = until release)"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+        if self.in_flight >= int(self.limit):
+            return None
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate
+
+        self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def acquire(self):
+        with self.condition:
+            self.waiting += 1
+            try:
+                while True:
+                    wait = self.try_acquire()
+                    if wait == 0:
+                        return
+                    self.condition.wait(timeout=wait)
+            finally:
+                self.waiting -= 1
+
+    async def acquire_async(self):
+        with self.condition:
+            self.waiting += 1
+        try:
+            while True:
+                with self.condition:
+                    wait = self.try_acquire()
+                if wait == 0:
+                    return
+                # Released slots cannot wake up the event loop, so we poll for them
+                await asyncio.sleep(wait if wait is not None else 0.05)
+        finally:
+            with self.condition:
+                self.waiting -= 1
+
+    def release(self, status=None, latency=0):
+        with self.condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            failed = status is None or status == 429 or status >= 500
+            if failed or latency > self.slow_threshold:
+                # Only back off once per slow window, requests in flight report the same
+                if now - self.last_decrease > self.slow_threshold:
+                    self.limit = max(self.min_concurrency, self.limit * self.backoff)
+                    self.last_decrease = now
+                    logger.debug(
+                        "Backing off to %s concurrent requests (status %s, %.2fs)",
+                        int(self.limit),
+                        status,
+                        latency,
+                    )
+                if status == 429:
+                    # Throttled by the server, pause until the bucket refilled
+                    self.tokens = 0
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+            self.condition.notify_all()
+
+    def slot(self) -> "RateLimiterSlot":
+        return RateLimiterSlot(self)
+
+    def stats(self) -> dict:
+        with self.condition:
+            return {
+                "rate": self.rate,
+                "tokens": self.tokens,
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queue_depth": self.waiting,
+            }
+
+
+class RateLimiterSlot:
+    """Context manager holding a slot, the caller stores the response status on it"""
+
+    def __init__(self, limiter: AdaptiveRateLimiter) -> None:
+        self.limiter = limiter
+        self.status = None
+        self.started = None
+
+    def __enter__(self):
+        self.limiter.acquire()
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.limiter.release(self.status, time.monotonic() - self.started)
+
+    async def __aenter__(self):
+        await self.limiter.acquire_async()
+        self.started = time.monotonic()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.limiter.release(self.status, time.monotonic() - self.started)
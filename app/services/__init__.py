@@ -7,8 +7,14 @@ __version__ = "1.0.0"
 from .base import BaseService
 from .routing import RoutingService, RoutingProgressEnum
 from .transport import TransportService
+from .async_transport import AsyncTransportService
+from .coalescing import CoalescingTransportService
 from .cli import CLIService
 from .cache import TransportCacheService
 from .location_autocomplet import LocationAutocompletService
 from .foreign_providers import ForeignProvidersService
 from .key_stations import KeyStationsService
+from .station_index import StationIndexService
+from .country_index import CountryIndexService
+from .country_cache import CountryCacheService
+from .route_cache import RouteCacheService
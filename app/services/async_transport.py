@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+
+import aiohttp
+import requests
+
+from .transport import TransportService
+from .. import utils
+from ..interning import InternRegistry
+from ..ratelimit import AdaptiveRateLimiter
+
+
+class AsyncTransportService(TransportService):
+    """TransportService issuing its requests through aiohttp
+
+    The parse_* functions are shared with TransportService, so both return the same
+    models. At most `concurrency` requests are in flight at the same time.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        concurrency: int = 8,
+        pool_size: int = 20,
+        connect_timeout: float = 5,
+        read_timeout: float = 30,
+        limiter: AdaptiveRateLimiter = None,
+        stations: InternRegistry = None,
+        session: requests.Session = None,
+    ) -> None:
+        # The session serves the inherited blocking functions
+        super().__init__(url, session=session, limiter=limiter, stations=stations)
+        self.concurrency = int(concurrency)
+        self.pool_size = int(pool_size)
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=float(connect_timeout), sock_read=float(read_timeout)
+        )
+        # aiohttp sessions and semaphores are bound to the loop they are created in
+        self.loop = None
+        self.async_session = None
+        self.session_guard = None
+        self.semaphore = None
+
+    async def get_async_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self.async_session is None or self.loop is not loop:
+            await self.close()
+            self.loop = loop
+            self.async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=self.timeout,
+            )
+            self.session_guard = self.guard_session(self.async_session)
+            await self.session_guard.__anext__()
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        return self.async_session
+
+    async def guard_session(self, session: aiohttp.ClientSession):
+        """Closes the session when its loop shuts down its async generators
+
+        asyncio.run does so before closing the loop, afterwards the loop could
+        not close the pooled connections anymore. Closing only closes sockets, it
+        does no blocking I/O on the loop, which may be the UI's.
+        """
+        try:
+            yield
+        finally:
+            await session.close()
+
+    async def close(self):
+        loop, guard = self.loop, self.session_guard
+        self.async_session = None
+        self.session_guard = None
+        self.loop = None
+        if guard is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await guard.aclose()
+        elif loop.is_running():
+            # The session belongs to a loop running in another thread
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(guard.aclose(), loop)
+            )
+
+    def encode_params(self, params: dict) -> list:
+        """aiohttp neither drops None values nor accepts booleans like requests does"""
+        encoded = []
+        for key, value in params.items():
+            if value is None:
+                continue
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                encoded.append((key, str(item)))
+        return encoded
+
+    async def fetch_async(self, path: str, params: dict) -> dict:
+        session = await self.get_async_session()
+        async with self.semaphore:
+            if self.limiter is None:
+                return await self.request(session, path, params)
+            async with self.limiter.slot() as slot:
+                return await self.request(session, path, params, slot)
+
+    async def request(self, session, path: str, params: dict, slot=None) -> dict:
+        async with session.get(
+            self.url + path, params=self.encode_params(params)
+        ) as response:
+            if slot:
+                slot.status = response.status
+            response.raise_for_status()
+            return utils.json_loads(await response.read())
+
+    async def search_locations_async(
+        self, query=None, x=None, y=None, location_type="all", projection=None
+    ):
+        data = await self.fetch_async(
+            "/locations", self.location_params(query, x, y, location_type, projection)
+        )
+        return self.parse_locations(data)
+
+    async def get_connections_async(self, departure, arrival, *args, **kwargs):
+        data = await self.fetch_async(
+            "/connections", self.connection_params(departure, arrival, *args, **kwargs)
+        )
+        return self.parse_connections(data)
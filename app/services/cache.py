@@ -4,19 +4,56 @@
 __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
+from collections import OrderedDict
+import asyncio
 from datetime import datetime
 import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
 
 from .base import BaseService
 from .transport import TransportService
+from ..store import PersistentCache
+from ..models import to_dict
 
 
 class TransportCacheService(BaseService):
-    def __init__(self, transport_service: TransportService, path: str) -> None:
+    def __init__(
+        self,
+        transport_service: TransportService,
+        path: str,
+        async_transport_service: TransportService = None,
+        location_cache: PersistentCache = None,
+        location_ttl: float = 7 * 24 * 3600,
+        location_empty_ttl: float = 3600,
+        coordinate_precision: int = 3,
+        connection_cache: PersistentCache = None,
+        connection_now_ttl: float = 300,
+        connection_future_ttl: float = 6 * 3600,
+        connection_max_entries: int = 256,
+    ) -> None:
         super().__init__()
         self.transport_service = transport_service
+        # Falls back to running the blocking service in a thread
+        self.async_transport_service = async_transport_service or transport_service
         self.path = path
         self.cache = {}
+        # Routing probes connections from several threads, each may blacklist one
+        self.blacklist_lock = threading.RLock()
+        self.location_cache = location_cache
+        self.location_ttl = float(location_ttl)
+        self.location_empty_ttl = float(location_empty_ttl)
+        self.coordinate_precision = int(coordinate_precision)
+        # Parsed connection results, held in memory and optionally persisted
+        self.connection_memory = OrderedDict()
+        self.connection_lock = threading.Lock()
+        self.connection_cache = connection_cache
+        self.connection_now_ttl = float(connection_now_ttl)
+        self.connection_future_ttl = float(connection_future_ttl)
+        self.connection_max_entries = int(connection_max_entries)
         self.load_from_file()
 
     def load_from_file(self):
@@ -32,29 +69,159 @@ class TransportCacheService(BaseService):
 
     def append_blacklist(self, start, dest):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.cache.setdefault(start, {})[dest] = timestamp
-        self.write_to_file()
+        with self.blacklist_lock:
+            self.cache.setdefault(start, {})[dest] = timestamp
+            self.write_to_file()
 
     def write_to_file(self):
-        with open(self.path, "w", newline="") as file:
-            fieldnames = ["start", "dest", "last_check"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for start, destinations in self.cache.items():
-                for dest, last_check in destinations.items():
-                    writer.writerow(
-                        {"start": start, "dest": dest, "last_check": last_check}
-                    )
+        # Written to a temporary file and swapped in, readers never see half a file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with self.blacklist_lock:
+            descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "w", newline="") as file:
+                    fieldnames = ["start", "dest", "last_check"]
+                    writer = csv.DictWriter(file, fieldnames=fieldnames)
+                    writer.writeheader()
+                    for start, destinations in self.cache.items():
+                        for dest, last_check in destinations.items():
+                            writer.writerow(
+                                {"start": start, "dest": dest, "last_check": last_check}
+                            )
+                self.copy_mode(temporary)
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.remove(temporary)
+                raise
+
+    def copy_mode(self, temporary):
+        # mkstemp creates files only the owner may read
+        try:
+            shutil.copymode(self.path, temporary)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temporary, 0o666 & ~umask)
 
     def check_blacklist(self, start, dest):
         if start in self.cache and dest in self.cache[start]:
             return True
         return False
 
+    def location_key(self, query, x, y, location_type, projection=None):
+        if query is not None:
+            return f"query:{location_type}:{projection}:{query.strip().lower()}"
+        return f"coordinate:{location_type}:{projection}:{x}:{y}"
+
+    def round_coordinate(self, value):
+        # Nearby sample points are snapped to the same grid point and share an entry
+        if value is None:
+            return None
+        return round(float(value), self.coordinate_precision)
+
+    def get_cached_locations(self, key):
+        cached = self.location_cache.get(key)
+        if cached is None:
+            return None
+        return self.transport_service.parse_locations({"stations": json.loads(cached)})
+
+    def set_cached_locations(self, key, locations):
+        # A station may open near an empty coordinate, or a query was misspelled
+        ttl = self.location_ttl if locations else self.location_empty_ttl
+        self.location_cache.set(
+            key, json.dumps([to_dict(location) for location in locations]), ttl
+        )
+
+    def connection_key(self, *params):
+        return json.dumps(params, default=str)
+
+    def connection_ttl(self, date, departure_time):
+        # Results for "now" go stale with every departure, planned trips do not
+        if date is None and departure_time is None:
+            return self.connection_now_ttl
+        return self.connection_future_ttl
+
+    def get_cached_connections(self, key):
+        now = datetime.now().timestamp()
+        with self.connection_lock:
+            entry = self.connection_memory.get(key)
+            if entry is not None:
+                expires, result = entry
+                if expires >= now:
+                    self.connection_memory.move_to_end(key)
+                    return list(result)
+                del self.connection_memory[key]
+
+        if self.connection_cache is None:
+            return None
+        cached = self.connection_cache.get(key)
+        if cached is None:
+            return None
+        data = json.loads(cached)
+        result = self.transport_service.parse_connections(
+            {"connections": data["connections"]}
+        )
+        self.remember_connections(key, result, data["expires"])
+        return list(result)
+
+    def set_cached_connections(self, key, result, ttl):
+        expires = datetime.now().timestamp() + ttl
+        self.remember_connections(key, result, expires)
+        if self.connection_cache is not None:
+            self.connection_cache.set(
+                key,
+                json.dumps(
+                    {
+                        "expires": expires,
+                        "connections": [
+                            self.dump_connection(connection) for connection in result
+                        ],
+                    }
+                ),
+                ttl,
+            )
+
+    def remember_connections(self, key, result, expires):
+        with self.connection_lock:
+            self.connection_memory[key] = (expires, list(result))
+            self.connection_memory.move_to_end(key)
+            while len(self.connection_memory) > self.connection_max_entries:
+                self.connection_memory.popitem(last=False)
+
+    def store_connections(self, key, result, departure, arrival, date, time):
+        # Failed requests raise before, only answered lookups get here. Without a
+        # date and time no connections means there are none at all, a dated lookup
+        # (like refetching details) only says there are none at that time.
+        if len(result) > 0:
+            self.set_cached_connections(key, result, self.connection_ttl(date, time))
+        elif date is None and time is None:
+            self.append_blacklist(departure, arrival)
+
+    def dump_connection(self, connection) -> dict:
+        """Converts a connection back into the shape returned by the transport API"""
+        data = to_dict(connection)
+        data["from"] = data.pop("_from")
+        return data
+
     # TransportService forwarded functions
 
-    def search_locations(self, query=None, x=None, y=None, location_type="all"):
-        return self.transport_service.search_locations(query, x, y, location_type)
+    def search_locations(
+        self, query=None, x=None, y=None, location_type="all", projection=None
+    ):
+        if self.location_cache is None:
+            return self.transport_service.search_locations(
+                query, x, y, location_type, projection
+            )
+
+        x, y = self.round_coordinate(x), self.round_coordinate(y)
+        key = self.location_key(query, x, y, location_type, projection)
+        result = self.get_cached_locations(key)
+        if result is None:
+            result = self.transport_service.search_locations(
+                query, x, y, location_type, projection
+            )
+            self.set_cached_locations(key, result)
+        return result
 
     def get_connections(
         self,
@@ -72,11 +239,12 @@ class TransportCacheService(BaseService):
         couchette=None,
         bike=None,
         accessibility=None,
+        projection=None,
     ):
         if self.check_blacklist(departure, arrival):
             return []
 
-        result = self.transport_service.get_connections(
+        params = (
             departure,
             arrival,
             via,
@@ -91,9 +259,82 @@ class TransportCacheService(BaseService):
             couchette,
             bike,
             accessibility,
+            projection,
         )
+        key = self.connection_key(*params)
+        result = self.get_cached_connections(key)
+        if result is not None:
+            return result
 
-        if len(result) == 0:
-            self.append_blacklist(departure, arrival)
+        result = self.transport_service.get_connections(*params)
+        self.store_connections(key, result, departure, arrival, date, time)
+        return result
+
+    async def search_locations_async(
+        self, query=None, x=None, y=None, location_type="all", projection=None
+    ):
+        if self.location_cache is None:
+            return await self.async_transport_service.search_locations_async(
+                query, x, y, location_type, projection
+            )
+
+        x, y = self.round_coordinate(x), self.round_coordinate(y)
+        key = self.location_key(query, x, y, location_type, projection)
+        # SQLite is not accessed on the event loop, which may be the UI's
+        result = await asyncio.to_thread(self.get_cached_locations, key)
+        if result is None:
+            result = await self.async_transport_service.search_locations_async(
+                query, x, y, location_type, projection
+            )
+            await asyncio.to_thread(self.set_cached_locations, key, result)
+        return result
+
+    async def get_connections_async(
+        self,
+        departure,
+        arrival,
+        via=None,
+        date=None,
+        time=None,
+        is_arrival_time=None,
+        transportations=None,
+        limit=None,
+        page=None,
+        direct=None,
+        sleeper=None,
+        couchette=None,
+        bike=None,
+        accessibility=None,
+        projection=None,
+    ):
+        if self.check_blacklist(departure, arrival):
+            return []
+
+        params = (
+            departure,
+            arrival,
+            via,
+            date,
+            time,
+            is_arrival_time,
+            transportations,
+            limit,
+            page,
+            direct,
+            sleeper,
+            couchette,
+            bike,
+            accessibility,
+            projection,
+        )
+        key = self.connection_key(*params)
+        # Neither SQLite nor the blacklist file are accessed on the event loop
+        result = await asyncio.to_thread(self.get_cached_connections, key)
+        if result is not None:
+            return result
 
+        result = await self.async_transport_service.get_connections_async(*params)
+        await asyncio.to_thread(
+            self.store_connections, key, result, departure, arrival, date, time
+        )
         return result
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import json
+
+from .base import BaseService
+from .transport import TransportService
+from ..singleflight import SingleFlight, AsyncSingleFlight
+
+
+class CoalescingTransportService(BaseService):
+    """Shares one network call between concurrent identical transport requests"""
+
+    def __init__(
+        self,
+        transport_service: TransportService,
+        async_transport_service: TransportService = None,
+    ) -> None:
+        super().__init__()
+        self.transport_service = transport_service
+        self.async_transport_service = async_transport_service or transport_service
+        self.flight = SingleFlight()
+        self.async_flight = AsyncSingleFlight()
+
+    def __getattr__(self, name):
+        # Everything else (parse_* functions, params, ...) comes from the wrapped service
+        if name == "transport_service":
+            raise AttributeError(name)
+        return getattr(self.transport_service, name)
+
+    def request_key(self, name, *args, **kwargs):
+        return json.dumps([name, args, sorted(kwargs.items())], default=str)
+
+    def search_locations(self, *args, **kwargs):
+        key = self.request_key("locations", *args, **kwargs)
+        result = self.flight.do(
+            key, self.transport_service.search_locations, *args, **kwargs
+        )
+        return list(result)
+
+    def get_connections(self, *args, **kwargs):
+        key = self.request_key("connections", *args, **kwargs)
+        result = self.flight.do(
+            key, self.transport_service.get_connections, *args, **kwargs
+        )
+        return list(result)
+
+    async def search_locations_async(self, *args, **kwargs):
+        key = self.request_key("locations", *args, **kwargs)
+        result = await self.async_flight.do(
+            key, self.async_transport_service.search_locations_async, *args, **kwargs
+        )
+        return list(result)
+
+    async def get_connections_async(self, *args, **kwargs):
+        key = self.request_key("connections", *args, **kwargs)
+        result = await self.async_flight.do(
+            key, self.async_transport_service.get_connections_async, *args, **kwargs
+        )
+        return list(result)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.flight.in_flight() + self.async_flight.in_flight(),
+            "shared": self.flight.shared + self.async_flight.shared,
+        }
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import math
+from typing import Optional
+
+from .base import BaseService
+from .country_index import CountryIndexService
+from ..store import PersistentCache
+
+# Coarse cells straddling a border, their points are cached at fine precision
+MIXED = "*"
+# Cached result of a point without a country (e.g. at sea)
+NO_COUNTRY = ""
+
+
+class CountryCacheService(BaseService):
+    """Persistent cache of reverse geocoded countries by grid cell
+
+    A point is cached for its whole coarse cell (10^-precision degrees) when the
+    country boundaries show the cell lies in one country, or do not cover any of
+    it, which is where routing asks the geocoder. Cells straddling a border or
+    the edge of the boundaries are cached per fine cell.
+    """
+
+    def __init__(
+        self,
+        cache: PersistentCache,
+        country_index: CountryIndexService = None,
+        precision: int = 1,
+        fine_precision: int = 3,
+        ttl: float = 30 * 24 * 3600,
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.country_index = country_index
+        self.precision = int(precision)
+        self.fine_precision = int(fine_precision)
+        self.ttl = float(ttl)
+
+    def cell(self, point, precision: int) -> tuple:
+        scale = 10**precision
+        return math.floor(point[0] * scale), math.floor(point[1] * scale)
+
+    def cell_key(self, point, precision: int) -> str:
+        lat, lon = self.cell(point, precision)
+        return f"{precision}:{lat}:{lon}"
+
+    def straddles_border(self, point) -> bool:
+        if self.country_index is None or len(self.country_index) == 0:
+            return True
+        # Corners, edge centers and center of the coarse cell
+        size = 10**-self.precision
+        lat, lon = (value * size for value in self.cell(point, self.precision))
+        countries = {
+            self.country_index.get_country(lat + i * size / 2, lon + j * size / 2)
+            for i in range(3)
+            for j in range(3)
+        }
+        # All None is a cell outside of the boundaries, not a border
+        return len(countries) != 1
+
+    def get(self, point) -> Optional[str]:
+        """Cached country code of a point, NO_COUNTRY for none, None if not cached"""
+        country = self.cache.get(self.cell_key(point, self.precision))
+        if country is None or country == MIXED:
+            return self.cache.get(self.cell_key(point, self.fine_precision))
+        return country
+
+    def set(self, point, country: Optional[str]) -> None:
+        country = country or NO_COUNTRY
+        coarse_key = self.cell_key(point, self.precision)
+        if self.straddles_border(point):
+            self.cache.set(coarse_key, MIXED, self.ttl)
+            self.cache.set(self.cell_key(point, self.fine_precision), country, self.ttl)
+        else:
+            self.cache.set(coarse_key, country, self.ttl)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+from typing import Optional
+
+import numpy as np
+
+from .base import BaseService
+
+
+class CountryIndexService(BaseService):
+    """Offline country lookup on bundled country boundaries (see app.countries)
+
+    Boundaries are rings of latitude, longitude points, holes included. Rings whose
+    bounding box contains a point are tested with a ray casting point in polygon
+    test, a point lies in a country when it is inside an odd number of its rings.
+    Returns lowercase ISO country codes like the Nominatim `country_code`.
+    """
+
+    def __init__(self, path: str = None) -> None:
+        super().__init__()
+        self.path = path
+        self.codes = np.empty(0, dtype=str)
+        self.rings = []
+        self.ring_countries = np.empty(0, dtype=np.int16)
+        self.bounds = np.empty((0, 4))
+        if path:
+            self.load_from_file()
+
+    def load_from_file(self):
+        try:
+            with np.load(self.path) as data:
+                coordinates = data["coordinates"].astype(float)
+                offsets = data["ring_offsets"]
+                self.codes = data["codes"]
+                self.ring_countries = data["ring_countries"]
+        except FileNotFoundError:
+            self.logger.info("No country boundaries at %s", self.path)
+            return
+
+        self.rings = [
+            coordinates[start:end] for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+        self.bounds = np.array(
+            [(*ring.min(axis=0), *ring.max(axis=0)) for ring in self.rings]
+        ).reshape(-1, 4)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def contains(self, ring: np.ndarray, lat: float, lon: float) -> bool:
+        lats, lons = ring[:, 0], ring[:, 1]
+        next_lats, next_lons = np.roll(lats, -1), np.roll(lons, -1)
+        # Edges crossing the latitude of the point, left of the point
+        crossing = (lats > lat) != (next_lats > lat)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            edge_lons = lons + (lat - lats) * (next_lons - lons) / (next_lats - lats)
+        return bool(np.count_nonzero(crossing & (lon < edge_lons)) % 2)
+
+    def get_country(self, lat: float, lon: float) -> Optional[str]:
+        """Country code at a coordinate, None outside of the bundled countries"""
+        candidates = np.flatnonzero(
+            (self.bounds[:, 0] <= lat)
+            & (lat <= self.bounds[:, 2])
+            & (self.bounds[:, 1] <= lon)
+            & (lon <= self.bounds[:, 3])
+        )
+        inside = {}
+        for index in candidates.tolist():
+            if self.contains(self.rings[index], lat, lon):
+                country = int(self.ring_countries[index])
+                inside[country] = not inside.get(country, False)
+        for country, is_inside in inside.items():
+            if is_inside:
+                return str(self.codes[country])
+        return None
@@ -5,6 +5,8 @@ __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
 import csv
+import hashlib
+import json
 
 from .base import BaseService
 from .. import models
@@ -30,6 +32,11 @@ class ForeignProvidersService(BaseService):
                 self.providers.append(provider)
         return self.providers
 
+    def fingerprint(self) -> str:
+        """Changes whenever the providers file changes"""
+        rows = [models.to_dict(provider) for provider in self.providers]
+        return hashlib.sha1(json.dumps(rows).encode()).hexdigest()
+
     def get(self, country_code) -> models.ForeignProvider:
         for provider in self.providers:
             if provider.country_code == country_code:
@@ -13,6 +13,7 @@ from typing import List
 from .base import BaseService
 from .transport import TransportService
 from .. import models
+from ..columnar import ConnectionTable
 
 
 class KeyStationsService(BaseService):
@@ -91,7 +92,10 @@ class KeyStationsService(BaseService):
         start = self.home_station
         tracking = []
         for i, station in enumerate(self.key_stations):
-            connections = self.transport_service.get_connections(start, station)
+            # Only the arrival station coordinates are needed
+            connections = self.transport_service.get_connections(
+                start, station, projection="routing-probe"
+            )
 
             if on_progress:
                 on_progress(len(self.key_stations), i)
@@ -103,13 +107,17 @@ class KeyStationsService(BaseService):
                     )
                 )
             else:
+                # Connections without arrival coordinates cannot be shown on the map
+                located = ConnectionTable.from_connections(
+                    connections
+                ).with_arrival_coordinates()
                 tracking.append(
                     models.KeyStationTracking(
                         start=start,
                         station=station,
                         reachable=True,
-                        latitude=connections[0].to.station.coordinate.x,
-                        longitude=connections[0].to.station.coordinate.y,
+                        latitude=float(located["to_lat"][0]) if len(located) else None,
+                        longitude=float(located["to_lon"][0]) if len(located) else None,
                     )
                 )
         self.key_stations_tracking = tracking
@@ -10,8 +10,9 @@ from .base import BaseService
 
 
 class LocationAutocompletService(BaseService):
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, session: requests.Session = None) -> None:
         self.url = url
+        self.session = session or requests.Session()
         super().__init__()
 
     def search_completion(self, term, nofavorites=1, show_ids=0, show_coordinates=0):
@@ -21,5 +22,5 @@ class LocationAutocompletService(BaseService):
             "show_ids": show_ids,
             "show_coordinates": show_coordinates,
         }
-        response = requests.get(self.url + "/completion.json", params=params)
+        response = self.session.get(self.url + "/completion.json", params=params)
         return response.json()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import hashlib
+import json
+import time
+from typing import Optional
+
+from .base import BaseService
+from .cache import TransportCacheService
+from .foreign_providers import ForeignProvidersService
+from .transport import TransportService
+from ..store import PersistentCache
+from ..models import (
+    Route,
+    RouteConnection,
+    RouteConnectionProvider,
+    RouteLocation,
+    fields_of,
+    to_dict,
+)
+
+
+class RouteCacheService(BaseService):
+    """Persistent memo of complete routes
+
+    Routes are keyed by the normalized start and destination, the sampling and
+    probing settings and the time bucket they were planned in, a route planned now
+    answers the same trip until its bucket of `bucket_seconds` ends. Keys contain
+    a fingerprint of the foreign providers, changing them invalidates all routes.
+
+    Each route also keeps the blacklist state of the connections it depends on,
+    from its start to the destination and to each connecting station. A route is
+    only answered while none of them was blacklisted or removed from the blacklist,
+    planning other trips does not invalidate it.
+    """
+
+    def __init__(
+        self,
+        cache: PersistentCache,
+        transport_service: TransportService,
+        blacklist: TransportCacheService = None,
+        foreign_providers: ForeignProvidersService = None,
+        bucket_seconds: float = 900,
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.transport_service = transport_service
+        self.blacklist = blacklist
+        self.foreign_providers = foreign_providers
+        self.bucket_seconds = float(bucket_seconds)
+
+    def fingerprint(self) -> str:
+        providers = (
+            self.foreign_providers.fingerprint() if self.foreign_providers else ""
+        )
+        return hashlib.sha1(providers.encode()).hexdigest()[:16]
+
+    def blacklisted(self, start: str, destinations) -> list:
+        """Blacklist state of the connections from start to each destination"""
+        if self.blacklist is None:
+            return []
+        return [
+            [destination, self.blacklist.check_blacklist(start, destination)]
+            for destination in destinations
+        ]
+
+    def dependencies(self, destination: str, route: Route) -> list:
+        stations = [station.name for station in route.connecting_stations or []]
+        return list(dict.fromkeys([destination, *stations]))
+
+    def bucket(self, now: float = None) -> int:
+        return int((time.time() if now is None else now) // self.bucket_seconds)
+
+    def key(
+        self,
+        start: str,
+        destination: str,
+        steps: int,
+        nearness: int,
+        settings: list = (),
+        now=None,
+    ) -> str:
+        start, destination = (
+            " ".join(name.split()).lower() for name in (start, destination)
+        )
+        return json.dumps(
+            [
+                self.bucket(now),
+                self.fingerprint(),
+                start,
+                destination,
+                steps,
+                nearness,
+                *settings,
+            ]
+        )
+
+    def get(self, key: str) -> Optional[Route]:
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        entry = json.loads(cached)
+        destinations = [destination for destination, _ in entry["blacklisted"]]
+        if self.blacklisted(entry["start"], destinations) != entry["blacklisted"]:
+            self.cache.delete(key)
+            return None
+        return self.load_route(entry["route"])
+
+    def set(
+        self,
+        key: str,
+        route: Route,
+        start: str,
+        destination: str,
+        now: float = None,
+    ) -> None:
+        now = time.time() if now is None else now
+        # Until the end of the bucket the route was planned in
+        ttl = (self.bucket(now) + 1) * self.bucket_seconds - now
+        entry = {
+            "start": start,
+            "blacklisted": self.blacklisted(
+                start, self.dependencies(destination, route)
+            ),
+            "route": self.dump_route(route),
+        }
+        self.cache.set(key, json.dumps(entry), ttl)
+
+    def dump_route(self, route: Route) -> dict:
+        data = to_dict(route)
+        if route.service_end_countries is not None:
+            data["service_end_countries"] = sorted(
+                route.service_end_countries, key=lambda country: country or ""
+            )
+        for connection in data["connections"] or []:
+            connection["from"] = connection.pop("_from")
+        return data
+
+    def load_route(self, data: dict) -> Route:
+        parse_location = self.transport_service.parse_location
+        data["start"] = parse_location(data["start"])
+        data["destination"] = parse_location(data["destination"])
+        if data["service_end_countries"] is not None:
+            data["service_end_countries"] = set(data["service_end_countries"])
+        if data["best_coverage_providers"] is not None:
+            data["best_coverage_providers"] = [
+                RouteConnectionProvider(**provider)
+                for provider in data["best_coverage_providers"]
+            ]
+        if data["connecting_stations"] is not None:
+            data["connecting_stations"] = [
+                RouteLocation(
+                    country=station["country"], **fields_of(parse_location(station))
+                )
+                for station in data["connecting_stations"]
+            ]
+        if data["connections"] is not None:
+            data["connections"] = [
+                self.load_connection(connection) for connection in data["connections"]
+            ]
+        return Route(**data)
+
+    def load_connection(self, data: dict) -> RouteConnection:
+        providers = data["providers"]
+        return RouteConnection(
+            direct_connection=data["direct_connection"],
+            coverage=data["coverage"],
+            service_end_country=data["service_end_country"],
+            providers=None
+            if providers is None
+            else [RouteConnectionProvider(**provider) for provider in providers],
+            projection=data["projection"],
+            **fields_of(self.transport_service.parse_connection(data)),
+        )
@@ -4,14 +4,24 @@
 __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
+import asyncio
 import math
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from enum import Enum
 from typing import List
+
+import numpy as np
 from geopy.geocoders import Nominatim
+from haversine import haversine
 
 from .base import BaseService
 from .transport import TransportService
 from .foreign_providers import ForeignProvidersService
+from .station_index import StationIndexService
+from .country_index import CountryIndexService
+from .country_cache import CountryCacheService
+from .route_cache import RouteCacheService
 from ..models import (
     Route,
     RoutingParameters,
@@ -20,8 +30,10 @@ from ..models import (
     RouteLocation,
     RouteConnection,
     RouteConnectionProvider,
+    fields_of,
 )
-from .. import geomath
+from .. import geomath, utils
+from ..columnar import ConnectionTable
 
 
 class RoutingProgressEnum(Enum):
@@ -30,7 +42,44 @@ class RoutingProgressEnum(Enum):
     ROUTING_INDIRECTLY = 3
 
 
+class SpeculativeProgress:
+    """Progress callback of a speculative task, held back until the task is needed
+
+    Raises CancelledError in the task once cancelled, which stops the sampling.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.callback = None
+        self.latest = None
+        self.cancelled = False
+
+    def __call__(self, total, step):
+        with self.lock:
+            if self.cancelled:
+                raise CancelledError()
+            self.latest = (total, step)
+            callback = self.callback
+        if callback:
+            callback(total, step)
+
+    def forward(self, callback) -> None:
+        """Reports the latest and all further progress to the callback"""
+        with self.lock:
+            self.callback = callback
+            latest = self.latest
+        if callback and latest:
+            callback(*latest)
+
+    def cancel(self) -> None:
+        with self.lock:
+            self.cancelled = True
+
+
 class RoutingService(BaseService):
+    # Routing only needs the endpoints of a connection, details are fetched on demand
+    PROJECTION = "routing-probe"
+
     def __init__(
         self,
         geolocator: Nominatim,
@@ -38,24 +87,93 @@ class RoutingService(BaseService):
         foreign_providers_service: ForeignProvidersService,
         steps: int,
         nearness: int,
+        sampling: str = "uniform",
+        coarse_steps: int = 8,
+        resolution: float = 5,
+        station_index: StationIndexService = None,
+        country_index: CountryIndexService = None,
+        country_cache: CountryCacheService = None,
+        probe_workers: int = 4,
+        coverage_threshold: float = 0.95,
+        probe_strategy: str = "parallel",
+        search_verify: int = 1,
+        speculative_sampling: bool = False,
+        route_cache: RouteCacheService = None,
     ) -> None:
         self.geolocator = geolocator
         self.transport = transport_service
         self.foreign_providers = foreign_providers_service
         self.steps = int(steps)
         self.nearness = int(nearness)
+        self.sampling = sampling
+        self.coarse_steps = int(coarse_steps)
+        self.resolution = float(resolution)
+        self.station_index = station_index
+        self.country_index = country_index
+        self.country_cache = country_cache
+        self.probe_workers = max(1, int(probe_workers))
+        self.coverage_threshold = float(coverage_threshold)
+        self.probe_strategy = probe_strategy
+        self.search_verify = int(search_verify)
+        self.speculative_sampling = speculative_sampling
+        self.route_cache = route_cache
+        self.probes = 0
+        self.probes_saved = 0
+        self.failed_probes = 0
         super().__init__()
 
     def get_country(self, point):
+        if self.country_index is not None:
+            country = self.country_index.get_country(point[0], point[1])
+            if country is not None:
+                return country
+        # Outside of the bundled countries we ask Nominatim, if it is enabled
+        if self.geolocator is None:
+            return None
+        if self.country_cache is not None:
+            country = self.country_cache.get(point)
+            if country is not None:
+                return country or None
+        country = self.reverse_geocode_country(point)
+        if self.country_cache is not None:
+            self.country_cache.set(point, country)
+        return country
+
+    def reverse_geocode_country(self, point):
         location = self.geolocator.reverse(f"{point[0]}, {point[1]}")
         if location and "country" in location.raw["address"]:
             return location.raw["address"]["country_code"]
         return None
 
+    def search_local_stations(self, point):
+        if self.station_index is None:
+            return None
+        return self.station_index.search_locations(point[0], point[1])
+
+    def search_stations(self, point) -> List[Location]:
+        """Stations around a point, from the station index when it covers the point"""
+        locations = self.search_local_stations(point)
+        if locations is not None:
+            return locations
+        return self.transport.search_locations(
+            x=point[0], y=point[1], location_type="station", projection=self.PROJECTION
+        )
+
+    async def search_stations_async(self, point) -> List[Location]:
+        locations = self.search_local_stations(point)
+        if locations is not None:
+            return locations
+        return await self.transport.search_locations_async(
+            x=point[0], y=point[1], location_type="station", projection=self.PROJECTION
+        )
+
     def find_connecting_stations(
         self, params: RoutingConnectingStationsParams, on_progress=None
     ) -> List[RouteLocation]:
         """Uses trigeometry to find stations in the line of sight of the start and destination"""
+        if params.sampling == "adaptive":
+            return self.find_connecting_stations_adaptive(params, on_progress)
+
         start = (params.start.coordinate.x, params.start.coordinate.y)
         dest = (params.destination.coordinate.x, params.destination.coordinate.y)
 
@@ -64,10 +182,7 @@ class RoutingService(BaseService):
             geomath.calculate_intermediate_coordinates(dest, start, params.steps)
         ):
             locations = self.filter_suitable_locations(
-                self.transport.search_locations(
-                    x=point[0], y=point[1], location_type="station"
-                ),
-                nearness=params.nearness,
+                self.search_stations(point), nearness=params.nearness
             )
 
             # Optional: Report progress
@@ -91,9 +206,178 @@ class RoutingService(BaseService):
                     if on_progress:
                         on_progress(params.steps, params.steps)
                     return stations
-                stations.append(RouteLocation(country=country, **location.__dict__))
+                stations.append(RouteLocation(country=country, **fields_of(location)))
+        return stations
+
+    async def find_connecting_stations_async(
+        self, params: RoutingConnectingStationsParams, on_progress=None
+    ) -> List[RouteLocation]:
+        """Same as find_connecting_stations but queries all sample points concurrently"""
+        if params.sampling == "adaptive":
+            return await self.find_connecting_stations_adaptive_async(
+                params, on_progress
+            )
+
+        start = (params.start.coordinate.x, params.start.coordinate.y)
+        dest = (params.destination.coordinate.x, params.destination.coordinate.y)
+
+        done = 0
+
+        async def search(point):
+            nonlocal done
+            locations = await self.search_stations_async(point)
+            done += 1
+            if on_progress:
+                on_progress(params.steps, done)
+            return locations
+
+        results = await asyncio.gather(
+            *[
+                search(point)
+                for point in geomath.calculate_intermediate_coordinates(
+                    dest, start, params.steps
+                )
+            ]
+        )
+
+        # Results are evaluated in sampling order, so the outcome equals the sequential one
+        stations = []
+        for result in results:
+            locations = self.filter_suitable_locations(result, nearness=params.nearness)
+
+            if len(locations) == 0:
+                continue
+
+            if params.only_nearest:
+                locations = [locations[0]]
+
+            # Nominatim only allows one request per second, so they are not parallelised
+            country = await asyncio.to_thread(
+                self.get_country, (locations[0].coordinate.x, locations[0].coordinate.y)
+            )
+
+            for location in locations:
+                if len(stations) > params.stop_at:
+                    return stations
+                stations.append(RouteLocation(country=country, **fields_of(location)))
         return stations
 
+    def sample(self, point, params: RoutingConnectingStationsParams) -> tuple:
+        """Suitable stations around a sample point and the country they are in"""
+        locations = self.filter_suitable_locations(
+            self.search_stations(point), nearness=params.nearness
+        )
+        if params.only_nearest:
+            locations = locations[:1]
+        if len(locations) == 0:
+            return locations, None
+        return locations, self.get_country(
+            (locations[0].coordinate.x, locations[0].coordinate.y)
+        )
+
+    async def sample_async(self, point, params: RoutingConnectingStationsParams):
+        locations = self.filter_suitable_locations(
+            await self.search_stations_async(point), nearness=params.nearness
+        )
+        if params.only_nearest:
+            locations = locations[:1]
+        if len(locations) == 0:
+            return locations, None
+        country = await asyncio.to_thread(
+            self.get_country, (locations[0].coordinate.x, locations[0].coordinate.y)
+        )
+        return locations, country
+
+    def refine_fractions(
+        self, samples: dict, length: float, params: RoutingConnectingStationsParams
+    ) -> List[float]:
+        """Midpoints between neighbouring samples whose stations or country differ"""
+        fractions = sorted(samples)
+        refined = []
+        for previous, current in zip(fractions, fractions[1:]):
+            if (current - previous) * length <= params.resolution:
+                continue
+            if self.sample_signature(samples[previous]) != self.sample_signature(
+                samples[current]
+            ):
+                refined.append((previous + current) / 2)
+        return refined
+
+    def sample_signature(self, sample: tuple) -> tuple:
+        locations, country = sample
+        return len(locations) > 0, country
+
+    def collect_stations(
+        self, samples: dict, params: RoutingConnectingStationsParams
+    ) -> List[RouteLocation]:
+        """Stations of the samples from the destination towards the start"""
+        stations = []
+        seen = set()
+        for fraction in sorted(samples):
+            locations, country = samples[fraction]
+            for location in locations:
+                # Neighbouring samples of refined intervals often find the same station
+                if location.id in seen:
+                    continue
+                if len(stations) > params.stop_at:
+                    return stations
+                seen.add(location.id)
+                stations.append(RouteLocation(country=country, **fields_of(location)))
+        return stations
+
+    def find_connecting_stations_adaptive(
+        self, params: RoutingConnectingStationsParams, on_progress=None
+    ) -> List[RouteLocation]:
+        """Samples coarse first and refines only where stations or the country change"""
+        start = (params.start.coordinate.x, params.start.coordinate.y)
+        dest = (params.destination.coordinate.x, params.destination.coordinate.y)
+        length = haversine(dest, start)
+
+        samples = {}
+        fractions = self.coarse_fractions(params)
+        while fractions:
+            total = len(samples) + len(fractions)
+            points = geomath.interpolate_great_circle(dest, start, fractions)
+            for fraction, point in zip(fractions, points):
+                samples[fraction] = self.sample(point, params)
+                if on_progress:
+                    on_progress(total, len(samples))
+            fractions = self.refine_fractions(samples, length, params)
+
+        self.logger.debug("Sampled %s points adaptively", len(samples))
+        return self.collect_stations(samples, params)
+
+    async def find_connecting_stations_adaptive_async(
+        self, params: RoutingConnectingStationsParams, on_progress=None
+    ) -> List[RouteLocation]:
+        """Same as find_connecting_stations_adaptive, each round runs concurrently"""
+        start = (params.start.coordinate.x, params.start.coordinate.y)
+        dest = (params.destination.coordinate.x, params.destination.coordinate.y)
+        length = haversine(dest, start)
+
+        samples = {}
+        fractions = self.coarse_fractions(params)
+        while fractions:
+            total = len(samples) + len(fractions)
+            points = geomath.interpolate_great_circle(dest, start, fractions)
+
+            async def sample(fraction, point):
+                samples[fraction] = await self.sample_async(point, params)
+                if on_progress:
+                    on_progress(total, len(samples))
+
+            await asyncio.gather(
+                *[sample(fraction, point) for fraction, point in zip(fractions, points)]
+            )
+            fractions = self.refine_fractions(samples, length, params)
+
+        self.logger.debug("Sampled %s points adaptively", len(samples))
+        return self.collect_stations(samples, params)
+
+    def coarse_fractions(self, params: RoutingConnectingStationsParams) -> List[float]:
+        steps = min(params.coarse_steps, params.steps)
+        return [i / (steps + 1) for i in range(1, steps + 1)]
+
     def find_follow_up_connections(self, start, dest):
         pass
 
@@ -114,46 +398,229 @@ class RoutingService(BaseService):
             filtered.sort(key=lambda x: x.distance or 999999)
         return filtered
 
-    def route(self, params: RoutingParameters, callback=None):
+    def direct_likely_fails(
+        self, params: RoutingParameters, destination_location: Location
+    ) -> bool:
+        """Guess without a network call that there is no direct connection"""
+        check_blacklist = getattr(self.transport, "check_blacklist", None)
+        if check_blacklist and check_blacklist(params.start, params.destination):
+            return True
+        if self.country_index is None:
+            return False
+        country = self.country_index.get_country(
+            destination_location.coordinate.x, destination_location.coordinate.y
+        )
+        return country is not None and country != "ch"
+
+    def route_key(self, params: RoutingParameters) -> str:
+        return self.route_cache.key(
+            params.start,
+            params.destination,
+            params.steps if params.steps else self.steps,
+            params.nearness if params.nearness else self.nearness,
+            # Routes planned with other settings may differ
+            settings=[
+                self.sampling,
+                self.coarse_steps,
+                self.resolution,
+                self.probe_strategy,
+                self.search_verify,
+                self.coverage_threshold,
+            ],
+        )
+
+    def memoizable(self, route: Route, failed_probes: int) -> bool:
+        # Without a connection, or with stations whose probes failed (e.g. while
+        # throttled), the route would answer the trip until its bucket ends
+        return route.found_connection and self.failed_probes == failed_probes
+
+    def route(self, params: RoutingParameters, callback=None) -> Route:
+        """Memoized find_route, see RouteCacheService"""
+        if self.route_cache is None:
+            return self.find_route(params, callback)
+        key = self.route_key(params)
+        route = self.route_cache.get(key)
+        if route is None:
+            failed_probes = self.failed_probes
+            route = self.find_route(params, callback)
+            if self.memoizable(route, failed_probes):
+                self.route_cache.set(key, route, params.start, params.destination)
+        return route
+
+    async def route_async(self, params: RoutingParameters, callback=None) -> Route:
+        if self.route_cache is None:
+            return await self.find_route_async(params, callback)
+        key = self.route_key(params)
+        route = self.route_cache.get(key)
+        if route is None:
+            failed_probes = self.failed_probes
+            route = await self.find_route_async(params, callback)
+            if self.memoizable(route, failed_probes):
+                self.route_cache.set(key, route, params.start, params.destination)
+        return route
+
+    def find_route(self, params: RoutingParameters, callback=None):
+        """Finds a route, the start, destination and direct lookups run concurrently
+
+        When the direct connection likely fails the connecting stations are sampled
+        speculatively while waiting for it, and dropped if there is one.
+        """
         if callback:
             callback(RoutingProgressEnum.ROUTING_DIRECTLY)
 
-        start_location = self.filter_suitable_locations(
-            self.transport.search_locations(params.start, location_type="station")
-        )[0]
-        destination_location = self.filter_suitable_locations(
-            self.transport.search_locations(params.destination, location_type="station")
-        )[0]
+        def stations_on_progress(total, step):
+            callback(RoutingProgressEnum.FINDING_CONNECTING_STATIONS, total, step)
+
+        executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="routing")
+        speculation = SpeculativeProgress()
+        try:
+            start_future = executor.submit(
+                self.transport.search_locations, params.start, location_type="station"
+            )
+            destination_future = executor.submit(
+                self.transport.search_locations,
+                params.destination,
+                location_type="station",
+            )
+            direct_future = executor.submit(
+                self.transport.get_connections,
+                params.start,
+                params.destination,
+                projection=self.PROJECTION,
+            )
+            start_location = self.filter_suitable_locations(start_future.result())[0]
+            destination_location = self.filter_suitable_locations(
+                destination_future.result()
+            )[0]
+            stations_params = self.connecting_stations_params(
+                params, start_location, destination_location
+            )
+
+            sampling = None
+            if self.speculative_sampling and self.direct_likely_fails(
+                params, destination_location
+            ):
+                sampling = executor.submit(
+                    self.find_connecting_stations,
+                    stations_params,
+                    on_progress=speculation,
+                )
 
-        direct = self.transport.get_connections(params.start, params.destination)
-        if len(direct) > 0:
+            direct = direct_future.result()
+            if len(direct) > 0:
+                return self.build_direct_route(
+                    start_location, destination_location, direct
+                )
+
+            if callback:
+                callback(RoutingProgressEnum.FINDING_CONNECTING_STATIONS)
+
+            if sampling is None:
+                connecting_stations = self.find_connecting_stations(
+                    stations_params,
+                    on_progress=stations_on_progress if callback else None,
+                )
+            else:
+                # The sampling thread does not call back, only its final progress
+                connecting_stations = sampling.result()
+                if callback and speculation.latest:
+                    stations_on_progress(*speculation.latest)
+        finally:
+            speculation.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if len(connecting_stations) == 0:
             return Route(
                 start=start_location,
                 destination=destination_location,
-                found_connection=True,
-                only_direct_routes=True,
-                connections=[
-                    RouteConnection(**connection.__dict__) for connection in direct
-                ],
+                found_connection=False,
             )
 
-        def stations_on_progress(total, step):
-            callback(RoutingProgressEnum.FINDING_CONNECTING_STATIONS, total, step)
+        def indirect_on_progress(total, step):
+            callback(RoutingProgressEnum.ROUTING_INDIRECTLY, total, step)
+
+        if callback:
+            # We send a small fractions as the current progress cannot be reset to zero
+            callback(
+                RoutingProgressEnum.ROUTING_INDIRECTLY, len(connecting_stations), 0.1
+            )
+
+        results = self.probe_connecting_stations(
+            params.start,
+            start_location,
+            destination_location,
+            connecting_stations,
+            on_progress=indirect_on_progress if callback else None,
+        )
 
+        return self.build_indirect_route(
+            start_location, destination_location, connecting_stations, results
+        )
+
+    async def find_route_async(self, params: RoutingParameters, callback=None):
+        """Same as find_route but issues the transport queries concurrently"""
         if callback:
-            callback(RoutingProgressEnum.FINDING_CONNECTING_STATIONS)
+            callback(RoutingProgressEnum.ROUTING_DIRECTLY)
 
-        connecting_stations = self.find_connecting_stations(
-            RoutingConnectingStationsParams(
-                start=start_location,
-                destination=destination_location,
-                steps=params.steps if params.steps else self.steps,
-                nearness=params.nearness if params.nearness else self.nearness,
-                # TODO: Add stop_at param to config and make overrideable
-                stop_at=10,
-            ),
-            on_progress=stations_on_progress if callback else None,
+        def stations_on_progress(total, step):
+            callback(RoutingProgressEnum.FINDING_CONNECTING_STATIONS, total, step)
+
+        direct_task = asyncio.ensure_future(
+            self.transport.get_connections_async(
+                params.start, params.destination, projection=self.PROJECTION
+            )
         )
+        tasks = [direct_task]
+        try:
+            start_locations, destination_locations = await asyncio.gather(
+                self.transport.search_locations_async(
+                    params.start, location_type="station"
+                ),
+                self.transport.search_locations_async(
+                    params.destination, location_type="station"
+                ),
+            )
+            start_location = self.filter_suitable_locations(start_locations)[0]
+            destination_location = self.filter_suitable_locations(
+                destination_locations
+            )[0]
+            stations_params = self.connecting_stations_params(
+                params, start_location, destination_location
+            )
+
+            speculation = None
+            if self.speculative_sampling and self.direct_likely_fails(
+                params, destination_location
+            ):
+                speculation = SpeculativeProgress()
+                tasks.append(
+                    asyncio.ensure_future(
+                        self.find_connecting_stations_async(
+                            stations_params, on_progress=speculation
+                        )
+                    )
+                )
+
+            direct = await direct_task
+            if len(direct) > 0:
+                return self.build_direct_route(
+                    start_location, destination_location, direct
+                )
+
+            if callback:
+                callback(RoutingProgressEnum.FINDING_CONNECTING_STATIONS)
+
+            if speculation is None:
+                connecting_stations = await self.find_connecting_stations_async(
+                    stations_params,
+                    on_progress=stations_on_progress if callback else None,
+                )
+            else:
+                speculation.forward(stations_on_progress if callback else None)
+                connecting_stations = await tasks[-1]
+        finally:
+            for task in tasks:
+                task.cancel()
 
         if len(connecting_stations) == 0:
             return Route(
@@ -162,96 +629,424 @@ class RoutingService(BaseService):
                 found_connection=False,
             )
 
-        def indirect_on_progress(total, step):
-            callback(RoutingProgressEnum.ROUTING_INDIRECTLY, total, step)
-
         if callback:
             # We send a small fractions as the current progress cannot be reset to zero
             callback(
                 RoutingProgressEnum.ROUTING_INDIRECTLY, len(connecting_stations), 0.1
             )
 
+        def indirect_on_progress(total, step):
+            callback(RoutingProgressEnum.ROUTING_INDIRECTLY, total, step)
+
+        results = await self.probe_connecting_stations_async(
+            params.start,
+            start_location,
+            destination_location,
+            connecting_stations,
+            on_progress=indirect_on_progress if callback else None,
+        )
+
+        return self.build_indirect_route(
+            start_location, destination_location, connecting_stations, results
+        )
+
+    def best_probe_coverage(
+        self, start_location: Location, destination_location: Location, connections
+    ) -> float:
+        """Highest coverage of the connections of one probe, -inf without any"""
+        coverages = self.calculate_coverages(
+            (start_location.coordinate.x, start_location.coordinate.y),
+            (destination_location.coordinate.x, destination_location.coordinate.y),
+            ConnectionTable.from_connections(connections),
+        )
+        return float(np.max(np.nan_to_num(coverages, nan=-np.inf), initial=-np.inf))
+
+    def probe_station(self, start: str, station: RouteLocation) -> list:
+        """Connections from the start to a station, none if the request fails"""
+        try:
+            return self.transport.get_connections(
+                start, station.name, projection=self.PROJECTION
+            )
+        except Exception:
+            self.failed_probes += 1
+            self.logger.warning("Probing %s failed", station.name, exc_info=True)
+            return []
+
+    async def probe_station_async(self, start: str, station: RouteLocation) -> list:
+        try:
+            return await self.transport.get_connections_async(
+                start, station.name, projection=self.PROJECTION
+            )
+        except Exception:
+            self.failed_probes += 1
+            self.logger.warning("Probing %s failed", station.name, exc_info=True)
+            return []
+
+    def probe_connecting_stations(
+        self,
+        start: str,
+        start_location: Location,
+        destination_location: Location,
+        connecting_stations: List[RouteLocation],
+        on_progress=None,
+    ) -> List[list]:
+        """Connections from the start to each connecting station, probed in parallel
+
+        Stations are submitted in order (closest to the destination first) to a pool
+        of probe_workers threads. Once a connection covers coverage_threshold of the
+        distance the pending probes are cancelled, their stations get no connections.
+        Probes already running are waited for, so none outlives the route (at most
+        probe_workers - 1 of them). A failed probe gives its station no connections.
+        Progress is reported from the calling thread as the probes complete.
+        With the "search" probe_strategy the stations are searched instead.
+        """
+        if self.probe_strategy == "search":
+            return self.search_connecting_stations(
+                start, connecting_stations, on_progress
+            )
+
+        results = [[] for _ in connecting_stations]
+        executor = ThreadPoolExecutor(
+            max_workers=self.probe_workers, thread_name_prefix="routing-probe"
+        )
+        try:
+            futures = {
+                executor.submit(self.probe_station, start, station): i
+                for i, station in enumerate(connecting_stations)
+            }
+            best, cancelled = -math.inf, 0
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                if on_progress:
+                    on_progress(len(connecting_stations), done)
+
+                best = max(
+                    best,
+                    self.best_probe_coverage(
+                        start_location, destination_location, results[futures[future]]
+                    ),
+                )
+                if best >= self.coverage_threshold:
+                    cancelled = sum(future.cancel() for future in futures)
+                    self.logger.debug(
+                        "Coverage %.2f reached, cancelled %d of %d probes",
+                        best,
+                        cancelled,
+                        len(futures),
+                    )
+                    break
+            self.record_probes(len(futures), len(futures) - cancelled)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    async def probe_connecting_stations_async(
+        self,
+        start: str,
+        start_location: Location,
+        destination_location: Location,
+        connecting_stations: List[RouteLocation],
+        on_progress=None,
+    ) -> List[list]:
+        """Same as probe_connecting_stations with at most probe_workers requests in flight"""
+        if self.probe_strategy == "search":
+            return await self.search_connecting_stations_async(
+                start, connecting_stations, on_progress
+            )
+
+        results = [[] for _ in connecting_stations]
+        semaphore = asyncio.Semaphore(self.probe_workers)
+
+        async def probe(i, station):
+            async with semaphore:
+                return i, await self.probe_station_async(start, station)
+
+        tasks = [
+            asyncio.ensure_future(probe(i, station))
+            for i, station in enumerate(connecting_stations)
+        ]
+        done = 0
+        try:
+            best = -math.inf
+            for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                i, connections = await task
+                results[i] = connections
+                if on_progress:
+                    on_progress(len(connecting_stations), done)
+
+                best = max(
+                    best,
+                    self.best_probe_coverage(
+                        start_location, destination_location, connections
+                    ),
+                )
+                if best >= self.coverage_threshold:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        # Tasks cancelled before their request are not counted as probes
+        self.record_probes(len(tasks), done)
+        return results
+
+    def search_reachable(self, total: int):
+        """Generator of the station indices to probe, send back if one is reachable
+
+        Stations are ordered from the destination back to the start and the ones
+        close to the start are the reachable ones. Gallops from the destination
+        (0, 1, 3, 7, ...) to the first reachable station, binary searches the gap
+        before it and then probes the next search_verify stations closer to the
+        destination which were not probed yet, in case reachability is not
+        monotone along the line.
+        """
+        reachable = {}
+
+        def probe(index):
+            if index not in reachable:
+                reachable[index] = yield index
+            return reachable[index]
+
+        unreachable, found, index = -1, None, 0
+        while index < total:
+            if (yield from probe(index)):
+                found = index
+                break
+            unreachable, index = index, 2 * index + 1
+        if found is None:
+            if total - 1 <= unreachable or not (yield from probe(total - 1)):
+                return
+            found = total - 1
+
+        low, high = unreachable + 1, found
+        while low < high:
+            middle = (low + high) // 2
+            if (yield from probe(middle)):
+                high = middle
+            else:
+                low = middle + 1
+        found = low
+
+        # The station before the found one was probed by the search, only
+        # stations probed here count towards search_verify
+        verified, index = 0, low - 1
+        while index >= 0 and verified < self.search_verify:
+            verified += index not in reachable
+            yield from probe(index)
+            index -= 1
+
+    def search_connecting_stations(
+        self, start: str, connecting_stations: List[RouteLocation], on_progress=None
+    ) -> List[list]:
+        """Probes only the stations search_reachable asks for, others get no connections"""
+        results = [[] for _ in connecting_stations]
+        search = self.search_reachable(len(connecting_stations))
+        probes = 0
+        try:
+            index = next(search)
+            while True:
+                results[index] = self.probe_station(start, connecting_stations[index])
+                probes += 1
+                if on_progress:
+                    on_progress(len(connecting_stations), probes)
+                index = search.send(len(results[index]) > 0)
+        except StopIteration:
+            pass
+
+        self.record_probes(len(connecting_stations), probes)
+        if on_progress:
+            on_progress(len(connecting_stations), len(connecting_stations))
+        return results
+
+    async def search_connecting_stations_async(
+        self, start: str, connecting_stations: List[RouteLocation], on_progress=None
+    ) -> List[list]:
+        results = [[] for _ in connecting_stations]
+        search = self.search_reachable(len(connecting_stations))
+        probes = 0
+        try:
+            index = next(search)
+            while True:
+                results[index] = await self.probe_station_async(
+                    start, connecting_stations[index]
+                )
+                probes += 1
+                if on_progress:
+                    on_progress(len(connecting_stations), probes)
+                index = search.send(len(results[index]) > 0)
+        except StopIteration:
+            pass
+
+        self.record_probes(len(connecting_stations), probes)
+        if on_progress:
+            on_progress(len(connecting_stations), len(connecting_stations))
+        return results
+
+    def record_probes(self, total: int, probes: int) -> None:
+        self.probes += probes
+        self.probes_saved += total - probes
+        self.logger.info("Probed %d of %d connecting stations", probes, total)
+
+    def stats(self) -> dict:
+        return {
+            "probes": self.probes,
+            "probes_saved": self.probes_saved,
+            "failed_probes": self.failed_probes,
+        }
+
+    def fetch_connection_details(self, connection: RouteConnection) -> RouteConnection:
+        """Refetches a connection found while routing with all of its details"""
+        if connection.projection is None:
+            return connection
+
+        departure = utils.api_datetime(connection._from.departureTimestamp)
+        candidates = self.transport.get_connections(
+            connection._from.station.name,
+            connection.to.station.name,
+            date=departure.strftime("%Y-%m-%d"),
+            time=departure.strftime("%H:%M"),
+        )
+        for candidate in candidates:
+            if (
+                candidate._from.departureTimestamp
+                == connection._from.departureTimestamp
+                and candidate.to.arrivalTimestamp == connection.to.arrivalTimestamp
+            ):
+                details = {
+                    **fields_of(connection),
+                    **fields_of(candidate),
+                    "projection": None,
+                }
+                return RouteConnection(**details)
+
+        self.logger.warning(
+            "Connection %s -> %s at %s is no longer available",
+            connection._from.station.name,
+            connection.to.station.name,
+            connection._from.departure,
+        )
+        return connection
+
+    def connecting_stations_params(
+        self,
+        params: RoutingParameters,
+        start_location: Location,
+        destination_location: Location,
+    ) -> RoutingConnectingStationsParams:
+        return RoutingConnectingStationsParams(
+            start=start_location,
+            destination=destination_location,
+            steps=params.steps if params.steps else self.steps,
+            nearness=params.nearness if params.nearness else self.nearness,
+            # TODO: Add stop_at param to config and make overrideable
+            stop_at=10,
+            sampling=self.sampling,
+            coarse_steps=self.coarse_steps,
+            resolution=self.resolution,
+        )
+
+    def build_direct_route(
+        self, start_location: Location, destination_location: Location, direct: list
+    ) -> Route:
+        return Route(
+            start=start_location,
+            destination=destination_location,
+            found_connection=True,
+            only_direct_routes=True,
+            connections=[
+                RouteConnection(projection=self.PROJECTION, **fields_of(connection))
+                for connection in direct
+            ],
+        )
+
+    def calculate_coverages(
+        self, start_latlg, destination_latlg, table: ConnectionTable
+    ) -> np.ndarray:
+        """Coverage of the start destination distance for each connection of the table"""
+        return geomath.calculate_coverage_percentages(
+            start_latlg, destination_latlg, table.arrival_coordinates()
+        )
+
+    def best_coverage_index(self, coverages: np.ndarray) -> int:
+        # Connections without coordinates have no coverage and are never preferred
+        return int(np.argmax(np.nan_to_num(coverages, nan=-np.inf)))
+
+    def build_indirect_route(
+        self,
+        start_location: Location,
+        destination_location: Location,
+        connecting_stations: List[RouteLocation],
+        results: List[list],
+    ) -> Route:
+        """Aggregates the connections found for each connecting station into a route"""
         start_latlg = (start_location.coordinate.x, start_location.coordinate.y)
         destination_latlg = (
             destination_location.coordinate.x,
             destination_location.coordinate.y,
         )
 
-        # Aggregation for recommendation
-        best_coverage = None
-        best_coverage_station = None
-        best_coverage_providers = None
+        probed = [
+            (station, connection)
+            for station, connections in zip(connecting_stations, results)
+            for connection in connections
+        ]
+        coverages = self.calculate_coverages(
+            start_latlg,
+            destination_latlg,
+            ConnectionTable.from_connections(connection for _, connection in probed),
+        )
 
         countries = set()
         alternative_stations = []
         alternative_connections = []
-        for i, station in enumerate(connecting_stations):
-            connections = self.transport.get_connections(params.start, station.name)
-
-            if callback:
-                indirect_on_progress(len(connecting_stations), i + 1)
-
-            if len(connections) == 0:
-                continue
-
+        # Stations returned without coordinates have no known coverage, shown as 0
+        shown_coverages = np.nan_to_num(coverages, nan=0.0)
+        for (station, connection), coverage in zip(probed, shown_coverages.tolist()):
             countries.add(station.country)
 
-            for connection in connections:
-                alternative_latlg = (
-                    connection.to.station.coordinate.x,
-                    connection.to.station.coordinate.y,
-                )
-                coverage = geomath.calculate_coverage_percentage(
-                    start_latlg, destination_latlg, alternative_latlg
+            providers = [
+                RouteConnectionProvider(
+                    name="SBB",
+                    url="https://www.sbb.ch",
+                    country="Schweiz",
+                    country_code="CH",
+                    coverage=coverage,
                 )
+            ]
 
-                providers = [
+            foreign_provider = self.foreign_providers.get(station.country)
+            if foreign_provider:
+                providers.append(
                     RouteConnectionProvider(
-                        name="SBB",
-                        url="https://www.sbb.ch",
-                        country="Schweiz",
-                        country_code="CH",
-                        coverage=coverage,
-                    )
-                ]
-
-                foreign_provider = self.foreign_providers.get(station.country)
-                if foreign_provider:
-                    providers.append(
-                        RouteConnectionProvider(
-                            name=foreign_provider.name,
-                            url=foreign_provider.url,
-                            country=foreign_provider.country,
-                            country_code=foreign_provider.country_code,
-                            coverage=1 - coverage,
-                        )
+                        name=foreign_provider.name,
+                        url=foreign_provider.url,
+                        country=foreign_provider.country,
+                        country_code=foreign_provider.country_code,
+                        coverage=1 - coverage,
                     )
-                else:
-                    providers.append(
-                        RouteConnectionProvider(
-                            name="Unknown",
-                            url="",
-                            country="",
-                            country_code=station.country,
-                            coverage=1 - coverage,
-                        )
+                )
+            else:
+                providers.append(
+                    RouteConnectionProvider(
+                        name="Unknown",
+                        url="",
+                        country="",
+                        country_code=station.country,
+                        coverage=1 - coverage,
                     )
+                )
 
-                if best_coverage is None or coverage > best_coverage:
-                    best_coverage = coverage
-                    best_coverage_station = connection.to.station.name
-                    best_coverage_providers = providers
-
-                alternative_stations.append(connection.to.station.name)
-                alternative_connections.append(
-                    RouteConnection(
-                        direct_connection=False,
-                        coverage=coverage,
-                        service_end_country=station.country,
-                        providers=providers,
-                        **connection.__dict__,
-                    )
+            alternative_stations.append(connection.to.station.name)
+            alternative_connections.append(
+                RouteConnection(
+                    direct_connection=False,
+                    coverage=coverage,
+                    service_end_country=station.country,
+                    providers=providers,
+                    projection=self.PROJECTION,
+                    **fields_of(connection),
                 )
+            )
 
         if len(alternative_connections) == 0:
             return Route(
@@ -260,6 +1055,8 @@ class RoutingService(BaseService):
                 found_connection=False,
             )
 
+        # Recommendation, the first connection wins on equal coverage
+        best = alternative_connections[self.best_coverage_index(coverages)]
         return Route(
             start=start_location,
             destination=destination_location,
@@ -267,8 +1064,8 @@ class RoutingService(BaseService):
             only_direct_routes=False,
             connecting_stations=connecting_stations,
             connections=alternative_connections,
-            best_coverage=best_coverage,
-            best_coverage_station=best_coverage_station,
-            best_coverage_providers=best_coverage_providers,
+            best_coverage=best.coverage,
+            best_coverage_station=best.to.station.name,
+            best_coverage_providers=best.providers,
             service_end_countries=countries,
         )
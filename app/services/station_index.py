@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+from typing import List, Optional
+
+import numpy as np
+
+from .base import BaseService
+from .. import geomath
+from ..interning import intern_string
+from ..models import Location, Coordinates
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+
+class StationIndexService(BaseService):
+    """Nearest station queries on a local station database
+
+    Stations are kept as unit vectors in a KD-tree (scipy) or searched brute force
+    with NumPy. Points whose nearest station is further than `max_distance` meters
+    are not covered by the index and return None, the caller asks the API instead.
+    """
+
+    def __init__(self, path: str = None, max_distance: int = 5000, limit: int = 10):
+        super().__init__()
+        self.path = path
+        self.max_distance = float(max_distance)
+        self.limit = int(limit)
+        self.ids = np.empty(0, dtype=str)
+        self.names = np.empty(0, dtype=str)
+        self.coordinates = np.empty((0, 2))
+        self.vectors = np.empty((0, 3))
+        self.tree = None
+        if path:
+            self.load_from_file()
+
+    def load_from_file(self):
+        try:
+            with np.load(self.path) as data:
+                self.set_stations(data["ids"], data["names"], data["coordinates"])
+        except FileNotFoundError:
+            self.logger.info("No station index at %s, using the API", self.path)
+
+    def set_stations(self, ids, names, coordinates):
+        self.ids = np.asarray(ids)
+        self.names = np.asarray(names)
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        self.vectors = geomath.convert_to_cartesian(self.coordinates)
+        self.tree = cKDTree(self.vectors) if cKDTree and len(self.ids) else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def nearest(self, x: float, y: float, limit: int):
+        """Indices and chord distances on the unit sphere of the nearest stations"""
+        vector = np.asarray(geomath.convert_to_cartesian((x, y)))
+        limit = min(limit, len(self))
+        if self.tree is not None:
+            distances, indices = self.tree.query(vector, k=limit)
+            return np.atleast_1d(indices), np.atleast_1d(distances)
+        # The nearest stations have the largest dot product with the unit vector
+        similarity = self.vectors @ vector
+        indices = np.argpartition(-similarity, limit - 1)[:limit]
+        indices = indices[np.argsort(-similarity[indices])]
+        return indices, np.sqrt(np.maximum(2 - 2 * similarity[indices], 0))
+
+    def search_locations(self, x: float, y: float) -> Optional[List[Location]]:
+        """Stations around a coordinate like /locations?x=&y=&type=station"""
+        if len(self) == 0:
+            return None
+        indices, chords = self.nearest(x, y, self.limit)
+        # Chord length on the unit sphere to the great circle distance in meters
+        distances = 2 * geomath.EARTH_RADIUS * 1000 * np.arcsin(chords / 2)
+        if distances[0] > self.max_distance:
+            return None
+        return [
+            Location(
+                id=intern_string(str(self.ids[index])),
+                type="station",
+                name=intern_string(str(self.names[index])),
+                score=None,
+                coordinate=Coordinates(
+                    type="WGS84",
+                    x=float(self.coordinates[index][0]),
+                    y=float(self.coordinates[index][1]),
+                ),
+                distance=round(float(distance)),
+            )
+            for index, distance in zip(indices.tolist(), distances.tolist())
+        ]
@@ -4,6 +4,9 @@
 __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
+import asyncio
+from typing import List
+
 import requests
 
 from ..models import (
@@ -15,22 +18,79 @@ from ..models import (
     Journey,
     Section,
     Service,
+    LazyList,
 )
 from .base import BaseService
 from .. import utils
+from ..columnar import ConnectionTable, number
+from ..interning import InternRegistry, intern_string
+from ..ratelimit import AdaptiveRateLimiter
+
+# Field projections (fields[] parameter) the API should limit its response to,
+# None returns complete objects. "routing-probe" contains what routing and the
+# connection list need, "detail" everything for the connection details.
+LOCATION_PROJECTIONS = {
+    "detail": None,
+    "routing-probe": [
+        "stations/id",
+        "stations/name",
+        "stations/type",
+        "stations/coordinate",
+        "stations/distance",
+    ],
+}
+CONNECTION_PROJECTIONS = {
+    "detail": None,
+    "routing-probe": [
+        "connections/from/departure",
+        "connections/from/departureTimestamp",
+        "connections/from/station/id",
+        "connections/from/station/name",
+        "connections/from/station/coordinate",
+        "connections/to/arrival",
+        "connections/to/arrivalTimestamp",
+        "connections/to/station/id",
+        "connections/to/station/name",
+        "connections/to/station/coordinate",
+        "connections/duration",
+        "connections/transfers",
+        "connections/products",
+    ],
+}
 
 
 class TransportService(BaseService):
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        session: requests.Session = None,
+        limiter: AdaptiveRateLimiter = None,
+        stations: InternRegistry = None,
+    ) -> None:
         self.url = url
+        self.session = session or requests.Session()
+        self.limiter = limiter
+        # Stations of stops repeat in every pass list and connection, they share
+        # one Location per station id
+        self.stations = InternRegistry() if stations is None else stations
         super().__init__()
 
-    def search_locations(self, query=None, x=None, y=None, location_type="all"):
-        params = {"query": query, "x": x, "y": y, "type": location_type}
-        response = requests.get(self.url + "/locations", params=params)
-        # We need to remove Nones for dict.get default to work
-        data = utils.clean_nones(response.json())
-        return [self.parse_location(item) for item in data.get("stations", [])]
+    def fetch(self, path: str, params: dict) -> dict:
+        if self.limiter is None:
+            response = self.session.get(self.url + path, params=params)
+        else:
+            with self.limiter.slot() as slot:
+                response = self.session.get(self.url + path, params=params)
+                slot.status = response.status_code
+        # Error bodies would parse into empty results, which look like no results
+        response.raise_for_status()
+        return utils.json_loads(response.content)
+
+    def search_locations(
+        self, query=None, x=None, y=None, location_type="all", projection=None
+    ):
+        params = self.location_params(query, x, y, location_type, projection)
+        return self.parse_locations(self.fetch("/locations", params))
 
     def get_connections(
         self,
@@ -48,8 +108,76 @@ class TransportService(BaseService):
         couchette=None,
         bike=None,
         accessibility=None,
+        projection=None,
+    ):
+        params = self.connection_params(
+            departure,
+            arrival,
+            via,
+            date,
+            time,
+            is_arrival_time,
+            transportations,
+            limit,
+            page,
+            direct,
+            sleeper,
+            couchette,
+            bike,
+            accessibility,
+            projection,
+        )
+        return self.parse_connections(self.fetch("/connections", params))
+
+    def get_connection_table(self, departure, arrival, *args, **kwargs):
+        """get_connections returning a ConnectionTable for batch analysis"""
+        params = self.connection_params(departure, arrival, *args, **kwargs)
+        return self.parse_connection_table(self.fetch("/connections", params))
+
+    # Async variants, AsyncTransportService overrides these with non-blocking IO
+
+    async def search_locations_async(
+        self, query=None, x=None, y=None, location_type="all", projection=None
     ):
-        params = {
+        return await asyncio.to_thread(
+            self.search_locations, query, x, y, location_type, projection
+        )
+
+    async def get_connections_async(self, departure, arrival, *args, **kwargs):
+        return await asyncio.to_thread(
+            self.get_connections, departure, arrival, *args, **kwargs
+        )
+
+    def location_params(
+        self, query=None, x=None, y=None, location_type="all", projection=None
+    ):
+        return {
+            "query": query,
+            "x": x,
+            "y": y,
+            "type": location_type,
+            "fields[]": LOCATION_PROJECTIONS.get(projection),
+        }
+
+    def connection_params(
+        self,
+        departure,
+        arrival,
+        via=None,
+        date=None,
+        time=None,
+        is_arrival_time=None,
+        transportations=None,
+        limit=None,
+        page=None,
+        direct=None,
+        sleeper=None,
+        couchette=None,
+        bike=None,
+        accessibility=None,
+        projection=None,
+    ):
+        return {
             "from": departure,
             "to": arrival,
             "via": via,
@@ -64,23 +192,57 @@ class TransportService(BaseService):
             "couchette": couchette,
             "bike": bike,
             "accessibility": accessibility,
+            "fields[]": CONNECTION_PROJECTIONS.get(projection),
         }
-        response = requests.get(self.url + "/connections", params=params)
-        # We need to remove Nones for dict.get default to work
-        data = utils.clean_nones(response.json())
-        return [self.parse_connection(item) for item in data.get("connections", [])]
+
+    # The parse_* functions read the decoded JSON as it is, the API returns nulls
+    # for missing values which utils.get_object and utils.get_list treat as absent
+
+    def parse_locations(self, data: dict) -> List[Location]:
+        return [self.parse_location(item) for item in utils.get_list(data, "stations")]
+
+    def parse_connections(self, data: dict) -> List[Connection]:
+        return [
+            self.parse_connection(item) for item in utils.get_list(data, "connections")
+        ]
+
+    def parse_connection_table(self, data: dict) -> ConnectionTable:
+        """Reads the connections into a ConnectionTable without creating models"""
+        records = []
+        for item in utils.get_list(data, "connections"):
+            departure = utils.get_object(item, "from")
+            arrival = utils.get_object(item, "to")
+            departure_station = utils.get_object(departure, "station")
+            arrival_station = utils.get_object(arrival, "station")
+            departure_coordinate = utils.get_object(departure_station, "coordinate")
+            arrival_coordinate = utils.get_object(arrival_station, "coordinate")
+            records.append(
+                (
+                    departure_station.get("id") or "",
+                    arrival_station.get("id") or "",
+                    number(departure_coordinate.get("x"), float("nan")),
+                    number(departure_coordinate.get("y"), float("nan")),
+                    number(arrival_coordinate.get("x"), float("nan")),
+                    number(arrival_coordinate.get("y"), float("nan")),
+                    number(utils.get_timestamp(departure, "departure")),
+                    number(utils.get_timestamp(arrival, "arrival")),
+                    number(utils.parse_duration_seconds(item.get("duration"))),
+                    number(item.get("transfers")),
+                )
+            )
+        return ConnectionTable.from_records(records)
 
     def parse_location(self, data: dict) -> Location:
-        coordinate_data = data.get("coordinate", {})
+        coordinate_data = utils.get_object(data, "coordinate")
         coordinates = Coordinates(
             type=coordinate_data.get("type"),
             x=coordinate_data.get("x"),
             y=coordinate_data.get("y"),
         )
         return Location(
-            id=data.get("id"),
-            type=data.get("type"),
-            name=data.get("name"),
+            id=intern_string(data.get("id")),
+            type=intern_string(data.get("type")),
+            name=intern_string(data.get("name")),
             score=data.get("score"),
             coordinate=coordinates,
             distance=data.get("distance"),
@@ -96,10 +258,11 @@ class TransportService(BaseService):
         )
 
     def parse_stop(self, data: dict) -> Stop:
-        prognosis_data = data.get("prognosis", {})
+        prognosis_data = utils.get_object(data, "prognosis")
         prognosis = self.parse_prognosis(prognosis_data)
-        station_data = data.get("station", {})
+        station_data = utils.get_object(data, "station")
         station = self.parse_location(station_data)
+        station = self.stations.intern(station.id, station)
         return Stop(
             station=station,
             arrival=data.get("arrival"),
@@ -107,29 +270,31 @@ class TransportService(BaseService):
             delay=data.get("delay"),
             platform=data.get("platform"),
             prognosis=prognosis,
+            arrivalTimestamp=utils.get_timestamp(data, "arrival"),
+            departureTimestamp=utils.get_timestamp(data, "departure"),
         )
 
     def parse_journey(self, data: dict) -> Journey:
-        pass_list_data = data.get("passList", [])
-        pass_list = [self.parse_stop(stop_data) for stop_data in pass_list_data]
+        # Pass lists are only needed in detail views, they are parsed on access
+        pass_list = LazyList(utils.get_list(data, "passList"), self.parse_stop)
         return Journey(
-            name=data.get("name"),
-            category=data.get("category"),
-            categoryCode=data.get("categoryCode"),
+            name=intern_string(data.get("name")),
+            category=intern_string(data.get("category")),
+            categoryCode=intern_string(data.get("categoryCode")),
             number=data.get("number"),
-            operator=data.get("operator"),
-            to=data.get("to"),
+            operator=intern_string(data.get("operator")),
+            to=intern_string(data.get("to")),
             passList=pass_list,
             capacity1st=data.get("capacity1st"),
             capacity2nd=data.get("capacity2nd"),
         )
 
     def parse_section(self, data: dict) -> Section:
-        journey_data = data.get("journey", {})
+        journey_data = utils.get_object(data, "journey")
         journey = self.parse_journey(journey_data)
-        departure_data = data.get("departure", {})
+        departure_data = utils.get_object(data, "departure")
         departure = self.parse_stop(departure_data)
-        arrival_data = data.get("arrival", {})
+        arrival_data = utils.get_object(data, "arrival")
         arrival = self.parse_stop(arrival_data)
         return Section(
             journey=journey, walk=data.get("walk"), departure=departure, arrival=arrival
@@ -139,13 +304,13 @@ class TransportService(BaseService):
         return Service(regular=data.get("regular"), irregular=data.get("irregular"))
 
     def parse_connection(self, data: dict) -> Connection:
-        section_data = data.get("sections", [])
-        sections = [self.parse_section(section_item) for section_item in section_data]
-        service_data = data.get("service", {})
+        # Sections are only needed in detail views, they are parsed on access
+        sections = LazyList(utils.get_list(data, "sections"), self.parse_section)
+        service_data = utils.get_object(data, "service")
         service = self.parse_service(service_data)
         return Connection(
-            _from=self.parse_stop(data.get("from", {})),
-            to=self.parse_stop(data.get("to", {})),
+            _from=self.parse_stop(utils.get_object(data, "from")),
+            to=self.parse_stop(utils.get_object(data, "to")),
             duration=data.get("duration"),
             service=service,
             products=data.get("products"),
@@ -153,4 +318,5 @@ class TransportService(BaseService):
             capacity2nd=data.get("capacity2nd"),
             transfers=data.get("transfers"),
             sections=sections,
+            duration_seconds=utils.parse_duration_seconds(data.get("duration")),
         )
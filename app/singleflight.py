@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Runs a function only once for concurrent callers using the same key
+
+    Callers arriving while a call for their key is in flight wait for it and
+    receive the same result (or exception) instead of starting their own call.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.calls[key] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+    def in_flight(self) -> int:
+        return len(self.calls)
+
+
+class AsyncSingleFlight:
+    """Same as SingleFlight for coroutine functions"""
+
+    def __init__(self) -> None:
+        self.calls = {}
+        self.shared = 0
+
+    async def do(self, key, fn, *args, **kwargs):
+        # Tasks are bound to their event loop, so calls are only shared within one
+        key = (id(asyncio.get_running_loop()), key)
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self.calls[key] = task
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        else:
+            self.shared += 1
+        # A cancelled caller must not cancel the call for everybody else
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self.calls)
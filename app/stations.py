@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+# Imports stations into the station index used by StationIndexService
+#
+#   python -m app.stations stops.txt ./data/stations.npz
+#
+# Reads a GTFS stops.txt (e.g. from opentransportdata.swiss) or a CSV with the
+# columns id, name, latitude and longitude.
+
+import argparse
+import csv
+
+import numpy as np
+
+
+def station_id(stop_id: str) -> str:
+    # GTFS stop ids of platforms and parents contain the station id,
+    # e.g. 8503000:0:3 and Parent8503000 belong to the station 8503000
+    return stop_id.removeprefix("Parent").split(":")[0]
+
+
+def read_stops(path: str) -> dict:
+    """Reads stations by their id, platforms are merged into their station"""
+    stations = {}
+    with open(path, "r", newline="", encoding="utf-8-sig") as file:
+        for row in csv.DictReader(file):
+            if "stop_id" in row:
+                # Entrances and other GTFS location types are no stations
+                if row.get("location_type") not in (None, "", "0", "1"):
+                    continue
+                id = station_id(row["stop_id"])
+                name = row["stop_name"]
+                latitude, longitude = row["stop_lat"], row["stop_lon"]
+            else:
+                id, name = row["id"], row["name"]
+                latitude, longitude = row["latitude"], row["longitude"]
+            if id not in stations:
+                stations[id] = (name, float(latitude), float(longitude))
+    return stations
+
+
+def import_stops(source: str, target: str) -> int:
+    stations = read_stops(source)
+    ids = list(stations)
+    names = [stations[id][0] for id in ids]
+    coordinates = np.array([stations[id][1:] for id in ids], dtype=float)
+    np.savez_compressed(
+        target,
+        ids=np.array(ids, dtype=str),
+        names=np.array(names, dtype=str),
+        coordinates=coordinates.reshape(-1, 2),
+    )
+    return len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Imports stations into an index")
+    parser.add_argument("source", help="GTFS stops.txt or CSV of stations")
+    parser.add_argument("target", help="station index to write, e.g. stations.npz")
+    args = parser.parse_args()
+    print(f"Imported {import_stops(args.source, args.target)} stations")
+
+
+if __name__ == "__main__":
+    main()
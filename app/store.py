@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class PersistentCache:
+    """SQLite backed key/value store with per entry TTL and a LRU size bound
+
+    Values are stored as text, callers are responsible for serializing them.
+    Use ":memory:" as path for a cache which is not persisted.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000) -> None:
+        self.path = path
+        self.max_entries = int(max_entries)
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(path) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Textual workers run in threads, access is serialized by the lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)"
+        )
+        self.connection.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, expires FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self.connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self.connection.commit()
+                return None
+            self.connection.execute(
+                "UPDATE cache SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.connection.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            self.evict()
+            self.connection.commit()
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.connection.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self.connection.commit()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.connection.execute("DELETE FROM cache")
+            self.connection.commit()
+
+    def evict(self) -> None:
+        """Drops expired entries and the least recently used ones above the bound"""
+        self.connection.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+        (count,) = self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count > self.max_entries:
+            self.connection.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
@@ -5,6 +5,8 @@ __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
 from textual.app import ComposeResult
+from textual.widgets import Label
+from textual.worker import Worker, WorkerState
 
 from .base import BaseScreen
 from .. import widgets
@@ -21,4 +23,25 @@ class ConnectionDetailsScreen(BaseScreen):
     def compose(self) -> ComposeResult:
         yield from super().compose()
         yield widgets.ConnectionOverviewWidget(self.connection)
-        yield widgets.ConnectionSectionsWidget(self.connection)
+        if self.connection.projection is None:
+            yield widgets.ConnectionSectionsWidget(self.connection)
+        else:
+            yield Label("Loading connection details", id="loading-details")
+
+    def on_mount(self) -> None:
+        # Routing only fetches the endpoints, the sections are loaded when opened
+        if self.connection.projection is not None:
+            self.run_worker(self.lookup_details, exclusive=True, exit_on_error=False)
+
+    def lookup_details(self) -> models.RouteConnection:
+        return self.app.routing_service.fetch_connection_details(self.connection)
+
+    def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
+        if event.state == WorkerState.SUCCESS:
+            self.connection = event.worker.result
+            self.query_one("#loading-details").remove()
+            self.mount(widgets.ConnectionSectionsWidget(self.connection))
+        if event.state == WorkerState.ERROR:
+            self.query_one("#loading-details").update(
+                "Connection details could not be loaded"
+            )
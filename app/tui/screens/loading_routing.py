@@ -23,8 +23,8 @@ class LoadingRoutingScreen(Screen):
     def on_mount(self) -> None:
         self.run_worker(self.lookup_route, exclusive=True, exit_on_error=False)
 
-    def lookup_route(self) -> models.Route:
-        return self.app.routing_service.route(
+    async def lookup_route(self) -> models.Route:
+        return await self.app.routing_service.route_async(
             models.RoutingParameters(start=self.start, destination=self.dest),
             self.routing_callback,
         )
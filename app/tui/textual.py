@@ -34,6 +34,7 @@ class TransportApp(App):
         routing_service: services.RoutingService,
         location_autocomplet_service: services.LocationAutocompletService,
         key_station_service: services.KeyStationsService,
+        async_transport_service: services.AsyncTransportService = None,
         driver_class=None,
         css_path=None,
         watch_css=False,
@@ -41,6 +42,7 @@ class TransportApp(App):
         self.routing_service = routing_service
         self.location_autocomplet_service = location_autocomplet_service
         self.key_station_service = key_station_service
+        self.async_transport_service = async_transport_service
         super().__init__(driver_class, css_path, watch_css)
 
     def on_mount(self) -> None:
@@ -67,7 +69,10 @@ class TransportApp(App):
                 )
             )
 
-    def action_quit(self) -> None:
+    async def action_quit(self) -> None:
+        # The aiohttp session lives on the app's event loop and has to be closed on it
+        if self.async_transport_service:
+            await self.async_transport_service.close()
         self.exit(0)
 
     def action_add_bar(self, color: str) -> None:
@@ -30,7 +30,9 @@ class ConnectionOverviewWidget(Widget):
         yield Label(f"From: {self.connection._from.station.name}")
         yield Label(f"To: {self.connection.to.station.name}")
         yield Label(f"Transfers: {self.connection.transfers}")
-        yield Label(f"Travel time: {utils.parse_duration(self.connection.duration)}")
+        yield Label(
+            f"Travel time: {utils.format_duration(self.connection.duration_seconds)}"
+        )
         yield Label(
             "Direct connection"
             if self.connection.direct_connection
@@ -109,8 +111,14 @@ class ConnectionSectionsWidget(Widget):
             departure = section.departure
             journey = section.journey
 
-            arrival_time = utils.prase_date(arrival.arrival) if arrival else ""
-            departure_time = utils.prase_date(departure.departure) if departure else ""
+            arrival_time = (
+                utils.format_timestamp(arrival.arrivalTimestamp) if arrival else ""
+            )
+            departure_time = (
+                utils.format_timestamp(departure.departureTimestamp)
+                if departure
+                else ""
+            )
             train = journey.number if journey else ""
             platform = departure.platform if departure else ""
             walk = section.walk.get("duration", "") or "" if section.walk else ""
@@ -122,9 +122,9 @@ class ConnectionTableWidget(Widget):
             row = [
                 connection._from.station.name,
                 connection.to.station.name,
-                utils.prase_date(connection._from.departure),
-                utils.prase_date(connection.to.arrival),
-                str(utils.parse_duration(connection.duration)),
+                utils.format_timestamp(connection._from.departureTimestamp),
+                utils.format_timestamp(connection.to.arrivalTimestamp),
+                utils.format_duration(connection.duration_seconds),
                 connection.transfers,
             ]
 
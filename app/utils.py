@@ -4,17 +4,53 @@
 __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
+import json
 import math
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def parse_duration(s: str) -> int:
-    duration_format = "%H:%M:%S"
-    # We have to make this akward split by 'd' as the transport API returns some weird timestamps
-    duration = datetime.strptime(s.split("d")[1], duration_format) - datetime.strptime(
-        "00:00:00", duration_format
+try:
+    TIMEZONE = ZoneInfo("Europe/Zurich")
+except ZoneInfoNotFoundError:
+    # Without the tz database (Windows without tzdata) see central_european_time
+    TIMEZONE = None
+
+CET = timezone(timedelta(hours=1), "CET")
+CEST = timezone(timedelta(hours=2), "CEST")
+
+
+def last_sunday_utc(year: int, month: int) -> float:
+    """Epoch seconds of the last Sunday of the month at 01:00 UTC"""
+    first_of_next = datetime(
+        year + month // 12, month % 12 + 1, 1, 1, tzinfo=timezone.utc
     )
-    hours, remainder = divmod(duration.total_seconds(), 3600)
+    last_day = first_of_next - timedelta(days=1)
+    return (last_day - timedelta(days=(last_day.weekday() + 1) % 7)).timestamp()
+
+
+def central_european_time(timestamp) -> timezone:
+    """Offset of Europe/Zurich at a time, CET with EU summer time (rules of 1996)"""
+    year = datetime.fromtimestamp(timestamp, timezone.utc).year
+    if last_sunday_utc(year, 3) <= timestamp < last_sunday_utc(year, 10):
+        return CEST
+    return CET
+
+
+def parse_duration(s: str) -> int:
+    return format_duration(parse_duration_seconds(s))
+
+
+@lru_cache(maxsize=1024)
+def format_duration(seconds) -> str:
+    if seconds is None:
+        return ""
+    hours, remainder = divmod(seconds, 3600)
     minutes, seconds = divmod(remainder, 60)
 
     parts = []
@@ -28,11 +64,65 @@ def parse_duration(s: str) -> int:
     return " ".join(parts)
 
 
+@lru_cache(maxsize=4096)
+def format_timestamp(timestamp) -> str:
+    """Formats epoch seconds like prase_date in the timezone of the transport API"""
+    if timestamp is None:
+        return ""
+    return api_datetime(timestamp).strftime("%Y-%m-%d %H:%M")
+
+
+def api_datetime(timestamp) -> datetime:
+    """Epoch seconds as a datetime in the timezone of the transport API"""
+    return datetime.fromtimestamp(
+        timestamp, TIMEZONE or central_european_time(timestamp)
+    )
+
+
 def prase_date(s: str) -> str:
     datetime_obj = datetime.strptime(s, "%Y-%m-%dT%H:%M:%S%z")
     return datetime_obj.strftime("%Y-%m-%d %H:%M")
 
 
+def parse_duration_seconds(s):
+    """Seconds of a transport API duration like 00d01:23:00, None if it is missing"""
+    if not s:
+        return None
+    days, _, clock = s.partition("d")
+    hours, minutes, seconds = clock.split(":")
+    return ((int(days) * 24 + int(hours)) * 60 + int(minutes)) * 60 + int(seconds)
+
+
+def parse_timestamp(s):
+    """Epoch seconds of a transport API date like 2023-05-01T10:00:00+0200"""
+    if not s:
+        return None
+    return int(datetime.strptime(s, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+
+
+def get_timestamp(data: dict, key: str):
+    """Epoch seconds of the date `key`, read from `<key>Timestamp` when present"""
+    timestamp = data.get(key + "Timestamp")
+    if timestamp is not None:
+        return int(timestamp)
+    return parse_timestamp(data.get(key))
+
+
+def parse_bool(s) -> bool:
+    if isinstance(s, bool):
+        return s
+    return str(s).strip().lower() in ("1", "true", "yes", "on")
+
+
+# providers.Selector matches its keys literally, config values are normalized first
+def bool_key(s) -> str:
+    return "true" if parse_bool(s) else "false"
+
+
+def choice_key(s) -> str:
+    return str(s).strip().lower()
+
+
 def parse_procent(d) -> str:
     return str(round(d * 100)) + "%"
 
@@ -49,3 +139,24 @@ def clean_nones(value):
         return {key: clean_nones(val) for key, val in value.items() if val is not None}
     else:
         return value
+
+
+def json_loads(data):
+    """Decodes JSON using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def get_object(data: dict, key: str) -> dict:
+    """dict.get for nested objects treating null as missing"""
+    value = data.get(key)
+    return {} if value is None else value
+
+
+def get_list(data: dict, key: str) -> list:
+    """dict.get for arrays treating null as missing, null items are dropped"""
+    value = data.get(key)
+    if value is None:
+        return []
+    return [item for item in value if item is not None]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+# Compares the former clean_nones + parse path against decoding in a single pass
+#
+#   python -m benchmarks.bench_decoder
+
+import json
+import timeit
+
+from app import utils
+from app.services import TransportService
+from .payloads import connections_payload
+
+
+def materialize(connections):
+    # Access everything, so lazily parsed sections count towards the result
+    for connection in connections:
+        for section in connection.sections:
+            list(section.journey.passList)
+
+
+def main(number=50):
+    transport = TransportService("http://localhost")
+    body = json.dumps(connections_payload()).encode()
+
+    def clean_nones_path():
+        return transport.parse_connections(utils.clean_nones(json.loads(body)))
+
+    def single_pass_path():
+        return transport.parse_connections(utils.json_loads(body))
+
+    def stdlib_single_pass_path():
+        return transport.parse_connections(json.loads(body))
+
+    assert clean_nones_path() == single_pass_path()
+
+    print(
+        f"/connections payload: {len(body) / 1024:.0f} KiB, orjson: {bool(utils.orjson)}"
+    )
+    for name, function in [
+        ("json + clean_nones + parse", clean_nones_path),
+        ("json + parse", stdlib_single_pass_path),
+        ("json_loads + parse", single_pass_path),
+    ]:
+        for label, run in [
+            ("endpoints", function),
+            ("everything", lambda: materialize(function())),
+        ]:
+            seconds = timeit.timeit(run, number=number) / number
+            print(f"{name:<28} {label:<10} {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
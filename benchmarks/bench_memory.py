@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+# Memory held by the models of one fully expanded route, slotted models compared
+# against the same dataclasses with a per instance __dict__
+#
+#   python -m benchmarks.bench_memory
+
+import dataclasses
+import gc
+import json
+import tracemalloc
+from unittest.mock import patch
+
+from app import models, utils
+from app.services import TransportService
+from app.services import transport as transport_module
+from .payloads import connections_payload
+
+PARSED_MODELS = [
+    "Location",
+    "Coordinates",
+    "Prognosis",
+    "Stop",
+    "Journey",
+    "Section",
+    "Service",
+    "Connection",
+]
+
+
+def unslotted(cls):
+    return dataclasses.make_dataclass(
+        cls.__name__,
+        [(field.name, field.type, field) for field in dataclasses.fields(cls)],
+    )
+
+
+def measure(body: bytes) -> tuple:
+    transport = TransportService("http://localhost")
+    gc.collect()
+    tracemalloc.start()
+    connections = transport.parse_connections(utils.json_loads(body))
+    # A route keeps every connection, expanded ones also their sections and stops
+    objects = 0
+    for connection in connections:
+        objects += 4
+        for section in connection.sections:
+            objects += 4 + 3 * len(section.journey.passList)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, objects
+
+
+def main():
+    body = json.dumps(connections_payload()).encode()
+
+    slotted, objects = measure(body)
+    with patch.multiple(
+        transport_module,
+        **{name: unslotted(getattr(models, name)) for name in PARSED_MODELS},
+    ):
+        with_dict, _ = measure(body)
+
+    print(f"Route with 16 expanded connections (~{objects} model instances)")
+    print(f"__dict__ models  {with_dict / 1024:8.0f} KiB")
+    print(f"slotted models   {slotted / 1024:8.0f} KiB")
+    print(f"reduction        {(1 - slotted / with_dict) * 100:8.0f} %")
+
+
+if __name__ == "__main__":
+    main()
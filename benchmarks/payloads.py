@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import random
+from datetime import datetime, timedelta
+
+# Synthetic payloads shaped like transport.opendata.ch responses, including the
+# many null fields the API returns
+
+STATIONS = [
+    ("8503000", "Zürich HB", 47.377847, 8.540502),
+    ("8503006", "Zürich Oerlikon", 47.411526, 8.544115),
+    ("8503016", "Zürich Flughafen", 47.450382, 8.562393),
+    ("8506000", "Winterthur", 47.500331, 8.723822),
+    ("8500010", "Basel SBB", 47.547408, 7.589547),
+    ("8507000", "Bern", 46.948825, 7.439122),
+    ("8505000", "Luzern", 47.050168, 8.310185),
+    ("8501008", "Genève", 46.210222, 6.142456),
+    ("8501120", "Lausanne", 46.516795, 6.629087),
+    ("8509000", "Chur", 46.853117, 9.528941),
+    ("8300207", "Milano Centrale", 45.486347, 9.204528),
+    ("8700011", "Paris Gare de Lyon", 48.844945, 2.373481),
+    ("8011160", "Berlin Hbf", 52.525589, 13.369548),
+    ("8100002", "Salzburg Hbf", 47.812866, 13.045648),
+]
+
+
+def station(rng: random.Random, index=None, distance=None) -> dict:
+    station_id, name, x, y = STATIONS[
+        index if index is not None else rng.randrange(len(STATIONS))
+    ]
+    return {
+        "id": station_id,
+        "name": name,
+        "score": None,
+        "coordinate": {"type": "WGS84", "x": x, "y": y},
+        "distance": distance,
+    }
+
+
+def timestamp(time: datetime) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S+0200")
+
+
+def stop(rng: random.Random, time: datetime, index=None) -> dict:
+    return {
+        "station": station(rng, index),
+        "arrival": timestamp(time),
+        "arrivalTimestamp": int(time.timestamp()),
+        "departure": timestamp(time + timedelta(minutes=1)),
+        "departureTimestamp": int(time.timestamp()) + 60,
+        "delay": None if rng.random() < 0.8 else rng.randrange(10),
+        "platform": str(rng.randrange(1, 20)),
+        "prognosis": {
+            "platform": None,
+            "arrival": None,
+            "departure": None,
+            "capacity1st": None,
+            "capacity2nd": None,
+        },
+        "realtimeAvailability": None,
+        "location": station(rng, index),
+    }
+
+
+def section(rng: random.Random, time: datetime, stops: int) -> dict:
+    pass_list = [stop(rng, time + timedelta(minutes=4 * i)) for i in range(stops)]
+    return {
+        "journey": {
+            "name": f"IC {rng.randrange(100, 999)}",
+            "category": "IC",
+            "subcategory": None,
+            "categoryCode": None,
+            "number": str(rng.randrange(100, 999)),
+            "operator": "SBB",
+            "to": pass_list[-1]["station"]["name"],
+            "passList": pass_list,
+            "capacity1st": None,
+            "capacity2nd": None,
+        },
+        "walk": None,
+        "departure": pass_list[0],
+        "arrival": pass_list[-1],
+    }
+
+
+def connection(rng: random.Random, time: datetime, sections=4, stops=15) -> dict:
+    parts = [section(rng, time + timedelta(hours=i), stops) for i in range(sections)]
+    duration = timedelta(hours=sections)
+    return {
+        "from": parts[0]["departure"],
+        "to": parts[-1]["arrival"],
+        "duration": f"00d0{duration.seconds // 3600}:00:00",
+        "transfers": sections - 1,
+        "service": None,
+        "products": [part["journey"]["category"] for part in parts],
+        "capacity1st": None,
+        "capacity2nd": None,
+        "sections": parts,
+    }
+
+
+def connections_payload(count=16, sections=4, stops=15, seed=1) -> dict:
+    """A /connections response, long international trips have ~4 sections a 15 stops"""
+    rng = random.Random(seed)
+    time = datetime(2023, 6, 1, 8)
+    return {
+        "connections": [
+            connection(rng, time + timedelta(minutes=30 * i), sections, stops)
+            for i in range(count)
+        ],
+        "from": station(rng, 0),
+        "to": station(rng, 11),
+        "stations": {"from": [station(rng, 0)], "to": [station(rng, 11)]},
+    }
+
+
+def locations_payload(count=10, seed=1) -> dict:
+    rng = random.Random(seed)
+    return {
+        "stations": [
+            station(rng, distance=rng.randrange(50, 5000)) for _ in range(count)
+        ]
+    }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+# Local stand-in for transport.opendata.ch and fahrplan.search.ch for load tests
+#
+#   python -m benchmarks.stub_server --port 8000 --latency lognormal:0.2:0.5
+#
+# Point [transport] url and [search] url in config.ini to http://localhost:8000.
+# Requests found in a recording corpus (see [recording]) are answered from it,
+# everything else with synthetic data.
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from app.recording import RecordingCorpus
+from . import payloads
+
+
+def request_key(url: str):
+    parts = urlsplit(url)
+    endpoint = parts.path.rstrip("/").rsplit("/", 1)[-1]
+    return endpoint, tuple(sorted(parse_qsl(parts.query)))
+
+
+def project(data, fields):
+    """Applies a fields[] projection like the transport API does"""
+    if not fields:
+        return data
+    tree = {}
+    for field in fields:
+        node = tree
+        for part in field.split("/"):
+            node = node.setdefault(part, {})
+    return project_tree(data, tree)
+
+
+def project_tree(data, tree):
+    if not tree:
+        return data
+    if isinstance(data, list):
+        return [project_tree(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {
+            key: project_tree(data[key], subtree)
+            for key, subtree in tree.items()
+            if key in data
+        }
+    return data
+
+
+class LatencyDistribution:
+    """Parses "fixed:0.1", "uniform:0.05:0.3" or "lognormal:<median>:<sigma>" """
+
+    def __init__(self, spec: str) -> None:
+        kind, *values = spec.split(":")
+        self.kind = kind
+        self.values = [float(value) for value in values]
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.values[0]
+        if self.kind == "uniform":
+            return rng.uniform(self.values[0], self.values[1])
+        if self.kind == "lognormal":
+            median, sigma = self.values
+            return median * rng.lognormvariate(0, sigma)
+        raise ValueError(f"Unknown latency distribution {self.kind}")
+
+
+class StubTransportServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        corpus: RecordingCorpus = None,
+        latency: LatencyDistribution = None,
+        error_rate: float = 0,
+        throttle_rate: float = 0,
+        seed: int = 1,
+    ) -> None:
+        super().__init__(address, StubTransportHandler)
+        self.recorded = {}
+        if corpus is not None:
+            for url, entry in corpus.load("http").items():
+                self.recorded[request_key(url)] = entry
+        self.latency = latency or LatencyDistribution("fixed:0")
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "recorded": 0, "errors": 0, "throttled": 0}
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.stats[name] += 1
+
+    def draw(self):
+        with self.lock:
+            return self.rng.random(), self.latency.sample(self.rng)
+
+    def synthetic(self, endpoint: str, params: dict, fields: list):
+        # Seeded by the query, so the same request always gets the same answer
+        seed = zlib.crc32(json.dumps(params, sort_keys=True).encode())
+        if endpoint == "locations":
+            data = payloads.locations_payload(seed=seed)
+            if params.get("query"):
+                data["stations"][0]["name"] = params["query"]
+        elif endpoint == "connections":
+            data = payloads.connections_payload(
+                count=int(params.get("limit", 4)), seed=seed
+            )
+            for connection in data["connections"]:
+                connection["from"]["station"]["name"] = params.get("from")
+                connection["to"]["station"]["name"] = params.get("to")
+        elif endpoint == "completion.json":
+            term = params.get("term", "")
+            return [{"label": f"{term} {name}"} for _, name, _, _ in payloads.STATIONS]
+        else:
+            return None
+        return project(data, fields)
+
+
+class StubTransportHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.count("requests")
+        chance, latency = server.draw()
+        time.sleep(latency)
+
+        if chance < server.throttle_rate:
+            server.count("throttled")
+            return self.respond(429, {"errors": [{"message": "Too many requests"}]})
+        if chance < server.throttle_rate + server.error_rate:
+            server.count("errors")
+            return self.respond(500, {"errors": [{"message": "Internal error"}]})
+
+        key = request_key(self.path)
+        entry = server.recorded.get(key)
+        if entry is not None:
+            server.count("recorded")
+            return self.respond(entry["status"], entry["body"].encode("utf-8"))
+
+        endpoint, query = key
+        params = {k: v for k, v in query if k != "fields[]"}
+        fields = [v for k, v in query if k == "fields[]"]
+        data = server.synthetic(endpoint, params, fields)
+        if data is None:
+            return self.respond(404, {"errors": [{"message": "Not found"}]})
+        self.respond(200, data)
+
+    def respond(self, status: int, body) -> None:
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--corpus", help="recording corpus to answer requests from")
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help='"fixed:<s>", "uniform:<min>:<max>" or "lognormal:<median>:<sigma>"',
+    )
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--throttle-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = StubTransportServer(
+        (args.host, args.port),
+        corpus=RecordingCorpus(args.corpus) if args.corpus else None,
+        latency=LatencyDistribution(args.latency),
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    print(f"Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+# Locations, API data and fake services shared by the routing tests
+
+import asyncio
+import threading
+import time
+
+from app.models import Location, Coordinates
+from app.services import TransportService
+
+BORDER = 6.0
+
+
+def location(name, lat, lon, distance=None):
+    return Location(
+        id=name,
+        type="station",
+        name=name,
+        score=None,
+        coordinate=Coordinates(type="WGS84", x=lat, y=lon),
+        distance=distance,
+    )
+
+
+def station(location):
+    """API data of a station"""
+    return {
+        "id": location.id,
+        "name": location.name,
+        "type": location.type,
+        "coordinate": {
+            "type": "WGS84",
+            "x": location.coordinate.x,
+            "y": location.coordinate.y,
+        },
+    }
+
+
+def connection(departure, arrival, departure_time=None, arrival_time=None, **fields):
+    """API data of a connection between two locations"""
+    data = {
+        "from": {"station": station(departure)},
+        "to": {"station": station(arrival)},
+        **fields,
+    }
+    if departure_time is not None:
+        data["from"]["departure"] = departure_time
+    if arrival_time is not None:
+        data["to"]["arrival"] = arrival_time
+    return data
+
+
+class FakeCountryIndex:
+    """Switzerland east of BORDER, France west of it"""
+
+    def get_country(self, lat, lon):
+        return "ch" if lon > BORDER else "fr"
+
+
+class FakeTransportService:
+    """A station at every searched point, connections straight to the arrival
+
+    Queries are answered from `stations`, which are also the ends of the
+    connections. Arrivals in `unreachable` have no connections, the ones in
+    `failing` raise. No stations are found west of `stations_from`.
+    """
+
+    def __init__(
+        self, stations=(), delay=0, unreachable=(), failing=(), stations_from=None
+    ):
+        self.stations = {station.name: station for station in stations}
+        self.delay = delay
+        self.unreachable = set(unreachable)
+        self.failing = set(failing)
+        self.stations_from = stations_from
+        self.parser = TransportService("http://localhost")
+        self.lock = threading.Lock()
+        self.searches = 0
+        self.probed = []
+
+    def search_locations(self, query=None, x=None, y=None, **kwargs):
+        with self.lock:
+            self.searches += 1
+        if query is not None:
+            return [self.stations[query]]
+        if self.stations_from is not None and y < self.stations_from:
+            return []
+        return [location(f"{x:.4f}:{y:.4f}", x, y, distance=2000)]
+
+    async def search_locations_async(self, *args, **kwargs):
+        return self.search_locations(*args, **kwargs)
+
+    def connections(self, departure, arrival):
+        with self.lock:
+            self.probed.append(arrival)
+        if arrival in self.failing:
+            raise RuntimeError(f"{arrival} failed")
+        if arrival in self.unreachable:
+            return []
+        return self.parser.parse_connections(
+            {
+                "connections": [
+                    connection(self.stations[departure], self.stations[arrival])
+                ]
+            }
+        )
+
+    def get_connections(self, departure, arrival, **kwargs):
+        time.sleep(self.delay)
+        return self.connections(departure, arrival)
+
+    async def get_connections_async(self, departure, arrival, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self.connections(departure, arrival)
+
+    def check_blacklist(self, start, dest):
+        return False
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import gc
+import json
+import threading
+import unittest
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock
+
+import requests
+
+from app.services import AsyncTransportService
+
+
+class AsyncTransportServiceTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.transport_service = AsyncTransportService("http://localhost", 2)
+
+    async def asyncTearDown(self):
+        await self.transport_service.close()
+
+    def test_uses_the_given_session(self):
+        session = requests.Session()
+
+        transport_service = AsyncTransportService("http://localhost", session=session)
+
+        self.assertIs(transport_service.session, session)
+        session.close()
+
+    def test_encode_params(self):
+        encoded = self.transport_service.encode_params(
+            {"from": "A", "to": None, "direct": True, "fields[]": ["x", "y"]}
+        )
+        self.assertEqual(
+            encoded,
+            [("from", "A"), ("direct", "True"), ("fields[]", "x"), ("fields[]", "y")],
+        )
+
+    async def test_get_connections_async(self):
+        self.transport_service.fetch_async = AsyncMock(
+            return_value={
+                "connections": [
+                    {"from": {"station": {"name": "A"}}, "to": {"station": None}}
+                ]
+            }
+        )
+
+        result = await self.transport_service.get_connections_async("A", "B")
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]._from.station.name, "A")
+        self.assertIsNone(result[0].to.station.name)
+        path, params = self.transport_service.fetch_async.call_args.args
+        self.assertEqual(path, "/connections")
+        self.assertEqual(params["from"], "A")
+        self.assertEqual(params["to"], "B")
+
+
+class LocationsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"stations": [{"id": "1", "name": "A"}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class AsyncTransportSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), LocationsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.transport_service = AsyncTransportService(
+            f"http://127.0.0.1:{self.server.server_port}"
+        )
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def search(self):
+        locations = await self.transport_service.search_locations_async("A")
+        return self.transport_service.async_session, locations
+
+    def test_closes_session_of_previous_loop(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            # The first loop ends with a pooled keep-alive connection
+            first, _ = asyncio.run(self.search())
+            second, locations = asyncio.run(self.search())
+            asyncio.run(self.transport_service.close())
+            del first, second
+            gc.collect()
+
+        self.assertEqual(locations[0].name, "A")
+        self.assertEqual(caught, [])
+
+    def test_closes_session_of_running_loop(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            first, _ = asyncio.run_coroutine_threadsafe(self.search(), loop).result()
+
+            asyncio.run(self.search())
+            asyncio.run(self.transport_service.close())
+
+            self.assertTrue(first.closed)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
@@ -4,12 +4,21 @@
 __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
+import asyncio
+import os
+import stat
+import tempfile
 import unittest
 import csv
+import threading
 from datetime import datetime
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
-from app.services import TransportCacheService
+import requests
+
+from app.services import TransportCacheService, TransportService
+from app.models import Location, Coordinates
+from app.store import PersistentCache
 
 
 class MockTransportService:
@@ -92,6 +101,43 @@ class TransportCacheServiceTests(unittest.TestCase):
             self.assertEqual(rows[0]["start"], "A")
             self.assertEqual(rows[0]["dest"], "B")
 
+    def test_append_blacklist_concurrently(self):
+        def append(thread):
+            for i in range(50):
+                self.cache_service.append_blacklist("A", f"{thread}:{i}")
+
+        threads = [threading.Thread(target=append, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.cache_service.cache["A"]), 400)
+        with open(self.test_file, "r", newline="") as file:
+            self.assertEqual(len(list(csv.DictReader(file))), 400)
+
+    def test_write_keeps_file_mode(self):
+        mode = stat.S_IMODE(os.stat(self.test_file).st_mode)
+        self.addCleanup(os.chmod, self.test_file, mode)
+        os.chmod(self.test_file, 0o640)
+
+        self.cache_service.append_blacklist("A", "B")
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.test_file).st_mode), 0o640)
+
+    def test_new_file_mode_follows_umask(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "blacklist.csv")
+            umask = os.umask(0o022)
+            try:
+                TransportCacheService(MockTransportService(), path).append_blacklist(
+                    "A", "B"
+                )
+            finally:
+                os.umask(umask)
+
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
     def test_check_blacklist(self):
         # Add an entry to the cache
         self.cache_service.cache = {
@@ -155,3 +201,174 @@ class TransportCacheServiceTests(unittest.TestCase):
         self.cache_service.append_blacklist = MagicMock()
         result = self.cache_service.get_connections("A", "B")
         self.cache_service.append_blacklist.assert_called_once_with("A", "B")
+
+
+class TransportCacheServiceLocationTests(unittest.TestCase):
+    def setUp(self):
+        self.test_file = "test_cache.csv"
+        self.transport_service = TransportService("http://localhost")
+        self.transport_service.search_locations = MagicMock(
+            return_value=[
+                Location(
+                    id="8503000",
+                    type="station",
+                    name="Zürich HB",
+                    score=None,
+                    coordinate=Coordinates(type="WGS84", x=47.377847, y=8.540502),
+                    distance=10,
+                )
+            ]
+        )
+        self.cache_service = TransportCacheService(
+            self.transport_service,
+            self.test_file,
+            location_cache=PersistentCache(":memory:"),
+            coordinate_precision=2,
+        )
+
+    def tearDown(self):
+        self.cache_service.location_cache.close()
+        with open(self.test_file, "w") as file:
+            file.truncate()
+
+    def test_search_locations_is_cached(self):
+        first = self.cache_service.search_locations(query="Zürich HB")
+        second = self.cache_service.search_locations(query="zürich hb ")
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first[0], second[0])
+        self.transport_service.search_locations.assert_called_once_with(
+            "Zürich HB", None, None, "all", None
+        )
+
+    def test_nearby_coordinates_share_entry(self):
+        self.cache_service.search_locations(
+            x=47.3771, y=8.5401, location_type="station"
+        )
+        self.cache_service.search_locations(
+            x=47.3789, y=8.5412, location_type="station"
+        )
+
+        self.transport_service.search_locations.assert_called_once_with(
+            None, 47.38, 8.54, "station", None
+        )
+
+    def test_empty_answers_expire_sooner(self):
+        store = self.cache_service.location_cache
+        store.set = MagicMock(wraps=store.set)
+        self.cache_service.search_locations(query="Zürich HB")
+        self.transport_service.search_locations.return_value = []
+        self.cache_service.search_locations(x=46.0, y=7.0)
+
+        ttls = [call.args[2] for call in store.set.call_args_list]
+        self.assertEqual(ttls, [7 * 24 * 3600, 3600])
+
+    def test_async_cache_is_not_accessed_on_the_loop(self):
+        store = self.cache_service.location_cache
+        threads = []
+        get = store.get
+        store.get = lambda key: threads.append(threading.get_ident()) or get(key)
+        self.transport_service.search_locations_async = AsyncMock(return_value=[])
+
+        asyncio.run(self.cache_service.search_locations_async(query="Bern"))
+
+        self.assertEqual(len(threads), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+
+class TransportCacheServiceConnectionTests(unittest.TestCase):
+    def setUp(self):
+        self.test_file = "test_cache.csv"
+        self.transport_service = TransportService("http://localhost")
+        self.transport_service.get_connections = MagicMock(
+            return_value=self.transport_service.parse_connections(
+                {
+                    "connections": [
+                        {
+                            "from": {"station": {"id": "1", "name": "A"}},
+                            "to": {"station": {"id": "2", "name": "B"}},
+                            "duration": "00d00:42:00",
+                            "sections": [{"walk": None, "journey": {"number": "12"}}],
+                        }
+                    ]
+                }
+            )
+        )
+        self.connection_cache = PersistentCache(":memory:")
+        self.cache_service = TransportCacheService(
+            self.transport_service,
+            self.test_file,
+            connection_cache=self.connection_cache,
+        )
+
+    def tearDown(self):
+        self.connection_cache.close()
+        with open(self.test_file, "w") as file:
+            file.truncate()
+
+    def test_get_connections_is_cached(self):
+        first = self.cache_service.get_connections("A", "B")
+        second = self.cache_service.get_connections("A", "B")
+        self.cache_service.get_connections("A", "B", date="2023-06-01")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.transport_service.get_connections.call_count, 2)
+
+    def test_get_connections_from_disk(self):
+        first = self.cache_service.get_connections("A", "B")
+        self.cache_service.connection_memory.clear()
+        second = self.cache_service.get_connections("A", "B")
+
+        self.assertEqual(first, second)
+        self.assertEqual(second[0].sections[0].journey.number, "12")
+        self.transport_service.get_connections.assert_called_once()
+
+    def test_failed_request_is_not_stored(self):
+        self.transport_service.get_connections.side_effect = requests.HTTPError("429")
+
+        with self.assertRaises(requests.HTTPError):
+            self.cache_service.get_connections("A", "B")
+
+        self.assertFalse(self.cache_service.check_blacklist("A", "B"))
+        self.assertEqual(len(self.cache_service.connection_memory), 0)
+        self.assertIsNone(self.connection_cache.get(self.connection_key("A", "B")))
+
+    def test_async_failed_request_is_not_stored(self):
+        self.cache_service.async_transport_service = MagicMock(
+            get_connections_async=AsyncMock(side_effect=requests.HTTPError("500"))
+        )
+
+        with self.assertRaises(requests.HTTPError):
+            asyncio.run(self.cache_service.get_connections_async("A", "B"))
+
+        self.assertFalse(self.cache_service.check_blacklist("A", "B"))
+        self.assertEqual(len(self.cache_service.connection_memory), 0)
+
+    def test_no_connections_blacklists(self):
+        self.transport_service.get_connections.return_value = []
+
+        self.cache_service.get_connections("A", "B", date="2023-06-01", time="10:00")
+        self.assertFalse(self.cache_service.check_blacklist("A", "B"))
+
+        self.cache_service.get_connections("A", "B")
+        self.assertTrue(self.cache_service.check_blacklist("A", "B"))
+
+    def connection_key(self, departure, arrival):
+        return self.cache_service.connection_key(departure, arrival, *[None] * 13)
+
+    def test_connection_memory_is_bounded(self):
+        self.cache_service.connection_max_entries = 2
+        for station in ["B", "C", "D"]:
+            self.cache_service.get_connections("A", station)
+
+        self.assertEqual(len(self.cache_service.connection_memory), 2)
+
+    def test_connection_ttl(self):
+        self.assertEqual(
+            self.cache_service.connection_ttl(None, None),
+            self.cache_service.connection_now_ttl,
+        )
+        self.assertEqual(
+            self.cache_service.connection_ttl("2023-06-01", "12:00"),
+            self.cache_service.connection_future_ttl,
+        )
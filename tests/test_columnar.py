@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import math
+import unittest
+
+from app.columnar import ConnectionTable, MISSING
+from app.services import TransportService
+
+
+def stop(station_id, x, y, time, timestamp):
+    return {
+        "station": {"id": station_id, "coordinate": {"x": x, "y": y}},
+        "departure": time,
+        "departureTimestamp": timestamp,
+        "arrival": time,
+        "arrivalTimestamp": timestamp,
+    }
+
+
+DATA = {
+    "connections": [
+        {
+            "from": stop("1", 47.0, 8.0, "2023-05-01T10:00:00+0200", 1682928000),
+            "to": stop("2", 46.0, 7.0, "2023-05-01T11:30:00+0200", 1682933400),
+            "duration": "00d01:30:00",
+            "transfers": 1,
+        },
+        {
+            "from": stop("1", 47.0, 8.0, "2023-05-01T09:00:00+0200", 1682924400),
+            "to": stop("3", None, None, "2023-05-01T09:45:00+0200", 1682927100),
+            "duration": "00d00:45:00",
+            "transfers": 0,
+        },
+        None,
+        {"from": None, "to": None, "duration": None, "transfers": None},
+    ]
+}
+
+
+class ConnectionTableTests(unittest.TestCase):
+    def setUp(self):
+        self.transport_service = TransportService("http://localhost")
+        self.table = self.transport_service.parse_connection_table(DATA)
+
+    def test_parse(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(list(self.table["to_id"]), ["2", "3", ""])
+        self.assertEqual(list(self.table["duration"]), [5400, 2700, MISSING])
+        self.assertEqual(self.table["departure"][0], 1682928000)
+        self.assertTrue(math.isnan(self.table["to_lat"][1]))
+
+    def test_same_table_from_models(self):
+        connections = self.transport_service.parse_connections(DATA)
+        table = ConnectionTable.from_connections(connections)
+
+        self.assertEqual(table.rows.tobytes(), self.table.rows.tobytes())
+
+    def test_timestamps_without_numeric_fields(self):
+        connection = DATA["connections"][0]
+        departure = {**connection["from"], "departureTimestamp": None}
+        table = self.transport_service.parse_connection_table(
+            {"connections": [{**connection, "from": departure}]}
+        )
+
+        self.assertEqual(table["departure"][0], 1682928000)
+
+    def test_sort_and_filter(self):
+        table = self.table.with_arrival_coordinates()
+        self.assertEqual(list(table["to_id"]), ["2"])
+
+        table = self.table.sort("duration", descending=True)
+        self.assertEqual(list(table["duration"]), [5400, 2700, MISSING])
+
+        table = self.table.departing_between(1682920000, 1682925000)
+        self.assertEqual(list(table["to_id"]), ["3"])
+
+    def test_concatenate(self):
+        table = ConnectionTable.concatenate([self.table, self.table[:1]])
+
+        self.assertEqual(len(table), 4)
+        self.assertEqual(len(ConnectionTable.concatenate([])), 0)
+
+    def test_stats(self):
+        stats = self.table.stats()
+
+        self.assertEqual(stats["connections"], 3)
+        self.assertEqual(stats["min_duration"], 2700)
+        self.assertEqual(stats["max_transfers"], 1)
+        self.assertEqual(ConnectionTable().stats()["min_duration"], None)
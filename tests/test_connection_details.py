@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from textual.app import App
+
+from app.models import RouteConnection, RouteConnectionProvider, fields_of
+from app.services import RoutingService, TransportService
+from app.tui.screens.connection_details import ConnectionDetailsScreen
+from app.tui.widgets import ConnectionSectionsWidget
+
+# 2023-05-01 10:00 and 11:30 in Zurich
+DEPARTURE, ARRIVAL = 1682928000, 1682933400
+
+
+def connection(departure, arrival, sections=None):
+    data = {
+        "from": {
+            "station": {"id": "1", "name": "Zürich HB"},
+            "departure": "2023-05-01T10:00:00+0200",
+            "departureTimestamp": departure,
+        },
+        "to": {
+            "station": {"id": "2", "name": "Basel SBB"},
+            "arrival": "2023-05-01T11:30:00+0200",
+            "arrivalTimestamp": arrival,
+        },
+        "duration": "00d01:30:00",
+        "transfers": 0,
+    }
+    if sections is not None:
+        data["sections"] = sections
+    return TransportService("http://localhost").parse_connection(data)
+
+
+def probed_connection():
+    return RouteConnection(
+        direct_connection=False,
+        coverage=0.6,
+        service_end_country="ch",
+        providers=[
+            RouteConnectionProvider("SBB", "https://www.sbb.ch", "Schweiz", "CH", 0.6)
+        ],
+        projection=RoutingService.PROJECTION,
+        **fields_of(connection(DEPARTURE, ARRIVAL)),
+    )
+
+
+class FetchConnectionDetailsTests(unittest.TestCase):
+    def setUp(self):
+        self.transport = MagicMock()
+        self.routing = RoutingService(
+            MagicMock(), self.transport, MagicMock(), 50, 1000
+        )
+
+    def test_resolves_probe_to_full_connection(self):
+        full = connection(DEPARTURE, ARRIVAL, [{"journey": {"name": "IC 3"}}])
+        self.transport.get_connections.return_value = [
+            connection(DEPARTURE - 1800, ARRIVAL - 1800, [{"journey": {"name": "IR"}}]),
+            full,
+        ]
+
+        details = self.routing.fetch_connection_details(probed_connection())
+
+        self.transport.get_connections.assert_called_once_with(
+            "Zürich HB", "Basel SBB", date="2023-05-01", time="10:00"
+        )
+        self.assertIsNone(details.projection)
+        self.assertEqual(details.sections[0].journey.name, "IC 3")
+        # Routing results are kept
+        self.assertEqual(details.coverage, 0.6)
+        self.assertFalse(details.direct_connection)
+        self.assertEqual(details.providers[0].name, "SBB")
+
+    def test_matches_departure_and_arrival(self):
+        # Same departure but a later arrival is another connection
+        self.transport.get_connections.return_value = [
+            connection(DEPARTURE, ARRIVAL + 600, [{"journey": {"name": "S"}}])
+        ]
+        probed = probed_connection()
+
+        with self.assertLogs(level="WARNING"):
+            details = self.routing.fetch_connection_details(probed)
+
+        self.assertIs(details, probed)
+
+    def test_complete_connection_is_not_fetched(self):
+        complete = probed_connection()
+        complete.projection = None
+
+        self.assertIs(self.routing.fetch_connection_details(complete), complete)
+        self.transport.get_connections.assert_not_called()
+
+
+class DetailsApp(App):
+    def __init__(self, routing_service, connection):
+        self.routing_service = routing_service
+        self.connection = connection
+        super().__init__()
+
+    def on_mount(self):
+        self.push_screen(ConnectionDetailsScreen(self.connection))
+
+
+class ConnectionDetailsScreenTests(unittest.TestCase):
+    def test_loads_details_when_opened(self):
+        routing = MagicMock()
+        full = probed_connection()
+        full.projection = None
+        routing.fetch_connection_details.return_value = full
+
+        async def run():
+            app = DetailsApp(routing, probed_connection())
+            async with app.run_test() as pilot:
+                await app.workers.wait_for_complete()
+                await pilot.pause()
+                screen = app.screen
+                return screen.connection, list(screen.query(ConnectionSectionsWidget))
+
+        shown, sections = asyncio.run(run())
+
+        routing.fetch_connection_details.assert_called_once()
+        self.assertIs(shown, full)
+        self.assertEqual(len(sections), 1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import unittest
+from unittest.mock import MagicMock
+
+from dependency_injector import providers
+
+from app.containers import Container
+from app.services import CountryCacheService
+from app.store import PersistentCache
+
+
+class FakeCountryIndex:
+    """Two countries with a border at longitude 8.55, nothing north of 48.05"""
+
+    def __len__(self):
+        return 2
+
+    def get_country(self, lat, lon):
+        if lat > 48.05:
+            return None
+        return "ch" if lon < 8.55 else "de"
+
+
+class CountryCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.store = PersistentCache(":memory:")
+        self.cache = CountryCacheService(
+            self.store, FakeCountryIndex(), precision=1, fine_precision=3
+        )
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_cell_within_one_country(self):
+        self.cache.set((47.37, 8.41), "ch")
+
+        self.assertEqual(self.cache.get((47.31, 8.49)), "ch")
+        self.assertIsNone(self.cache.get((47.41, 8.41)))
+
+    def test_cell_on_a_border(self):
+        self.cache.set((47.37, 8.51), "ch")
+
+        self.assertEqual(self.cache.get((47.3701, 8.5101)), "ch")
+        self.assertIsNone(self.cache.get((47.37, 8.58)))
+
+    def test_without_boundaries_only_fine_cells(self):
+        cache = CountryCacheService(self.store, None)
+        cache.set((47.37, 8.41), "ch")
+
+        self.assertEqual(cache.get((47.3701, 8.4101)), "ch")
+        self.assertIsNone(cache.get((47.31, 8.49)))
+
+    def test_no_country(self):
+        self.cache.set((47.37, 8.41), None)
+
+        self.assertEqual(self.cache.get((47.37, 8.41)), "")
+
+    def test_cell_outside_of_boundaries(self):
+        self.cache.set((52.37, 8.41), "nl")
+
+        self.assertEqual(self.cache.get((52.31, 8.49)), "nl")
+        self.assertEqual(self.store.get("1:523:84"), "nl")
+
+    def test_cell_on_the_edge_of_boundaries(self):
+        self.cache.set((48.01, 8.41), "de")
+
+        self.assertEqual(self.store.get("1:480:84"), "*")
+        self.assertIsNone(self.cache.get((48.09, 8.41)))
+
+
+class RoutingCountryCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.container = Container()
+        self.container.config.router.geocoder_fallback.from_value("true")
+        self.container.config.cache.route_persist.from_value("false")
+        self.container.config.data.country_cache.from_value(":memory:")
+        self.container.country_index_service.override(
+            providers.Object(FakeCountryIndex())
+        )
+        self.geolocator = MagicMock()
+        self.geolocator.reverse.return_value = MagicMock(
+            raw={"address": {"country": "Nederland", "country_code": "nl"}}
+        )
+        self.container.geolocator.override(providers.Object(self.geolocator))
+
+    def tearDown(self):
+        self.container.reset_override()
+
+    def test_routing_geocodes_a_cell_once(self):
+        routing = self.container.routing_service()
+        country_cache = self.container.country_cache_service()
+
+        # Routing and the cache look countries up in the same index
+        self.assertIs(routing.country_index, country_cache.country_index)
+        self.assertIs(routing.country_cache, country_cache)
+        self.assertEqual(routing.get_country((52.37, 8.41)), "nl")
+        self.assertEqual(routing.get_country((52.33, 8.44)), "nl")
+        self.geolocator.reverse.assert_called_once()
+        # Covered by the index, the geocoder is not asked
+        self.assertEqual(routing.get_country((47.37, 8.41)), "ch")
+        self.geolocator.reverse.assert_called_once()
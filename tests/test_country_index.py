@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from app.services import CountryIndexService, RoutingService
+
+COUNTRIES = os.path.join(os.path.dirname(__file__), "..", "data", "countries.npz")
+
+
+def square(lat, lon, size):
+    return [(lat, lon), (lat + size, lon), (lat + size, lon + size), (lat, lon + size)]
+
+
+class CountryIndexTests(unittest.TestCase):
+    def setUp(self):
+        # Country "aa" with a hole which is the country "bb"
+        rings = [square(0, 0, 10), square(4, 4, 2), square(4, 4, 2)]
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, "countries.npz")
+        np.savez(
+            path,
+            codes=np.array(["aa", "bb"]),
+            coordinates=np.concatenate(rings).astype(np.float32),
+            ring_offsets=np.array([0, 4, 8, 12]),
+            ring_countries=np.array([0, 0, 1]),
+        )
+        self.index = CountryIndexService(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_point_in_polygon(self):
+        self.assertEqual(self.index.get_country(1, 1), "aa")
+        self.assertEqual(self.index.get_country(5, 5), "bb")
+        self.assertIsNone(self.index.get_country(11, 5))
+
+    def test_missing_boundaries(self):
+        index = CountryIndexService(os.path.join(self.directory.name, "missing.npz"))
+
+        self.assertIsNone(index.get_country(1, 1))
+
+    def test_bundled_countries(self):
+        index = CountryIndexService(COUNTRIES)
+
+        self.assertEqual(index.get_country(47.377847, 8.540502), "ch")  # Zürich HB
+        self.assertEqual(index.get_country(47.547408, 7.589547), "ch")  # Basel SBB
+        self.assertEqual(index.get_country(47.141, 9.521), "li")  # Vaduz
+        self.assertEqual(index.get_country(47.697, 8.689), "de")  # Büsingen
+        self.assertEqual(index.get_country(45.486347, 9.204528), "it")  # Milano
+        self.assertEqual(index.get_country(48.844945, 2.373481), "fr")  # Paris
+        self.assertIsNone(index.get_country(45.0, -10.0))  # Atlantic
+
+    def test_routing_falls_back_to_the_geolocator(self):
+        geolocator = MagicMock()
+        geolocator.reverse.return_value = MagicMock(
+            raw={"address": {"country": "Portugal", "country_code": "pt"}}
+        )
+        routing = RoutingService(
+            geolocator, MagicMock(), MagicMock(), 10, 1000, country_index=self.index
+        )
+
+        self.assertEqual(routing.get_country((1, 1)), "aa")
+        geolocator.reverse.assert_not_called()
+
+        self.assertEqual(routing.get_country((20, 20)), "pt")
+        geolocator.reverse.assert_called_once()
+
+        routing.geolocator = None
+        self.assertIsNone(routing.get_country((20, 20)))
@@ -5,6 +5,10 @@ __author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
 __version__ = "1.0.0"
 
 import unittest
+
+import numpy as np
+from haversine import haversine
+
 from app import geomath
 
 
@@ -37,3 +41,51 @@ class GeomathTests(unittest.TestCase):
         cart = geomath.convert_to_cartesian(coord1)
         coord2 = geomath.convert_to_latlon(cart)
         self.assertCoordinatesAlmostEqual(coord1, coord2)
+
+    def test_batched_conversion(self):
+        coords = np.array([(47.408732, 8.723168), (-33.9, 151.2), (0, 0)])
+        cart = geomath.convert_to_cartesian(coords)
+        self.assertEqual(cart.shape, (3, 3))
+        for coord, point in zip(coords, cart):
+            self.assertTupleAlmostEqual(geomath.convert_to_cartesian(coord), point)
+        np.testing.assert_allclose(geomath.convert_to_latlon(cart), coords, atol=1e-9)
+
+    def test_intermediate_coordinates_on_great_circle(self):
+        start, end = (46.210222, 6.142456), (47.500331, 8.723822)
+        points = geomath.calculate_intermediate_coordinates(start, end, 3)
+
+        self.assertEqual(points.shape, (3, 2))
+        # Evenly spaced along the arc
+        path = [start, *map(tuple, points), end]
+        distances = [haversine(a, b) for a, b in zip(path, path[1:])]
+        for distance in distances:
+            self.assertAlmostEqual(distance, haversine(start, end) / 4, places=6)
+
+    def test_intermediate_coordinates_on_equator(self):
+        points = geomath.calculate_intermediate_coordinates((0, 0), (0, 90), 2)
+        np.testing.assert_allclose(points, [(0, 30), (0, 60)], atol=1e-9)
+
+    def test_intermediate_coordinates_of_same_coordinate(self):
+        points = geomath.calculate_intermediate_coordinates((47, 8), (47, 8), 2)
+        np.testing.assert_allclose(points, [(47, 8), (47, 8)])
+
+    def test_batched_coverage_equals_scalar(self):
+        start, end = (47.377847, 8.540502), (45.486347, 9.204528)
+        coords = np.array([(46.853117, 9.528941), (47.050168, 8.310185), start, end])
+
+        coverages = geomath.calculate_coverage_percentages(start, end, coords)
+
+        self.assertEqual(coverages.shape, (4,))
+        for coord, coverage in zip(coords, coverages):
+            self.assertAlmostEqual(
+                geomath.calculate_coverage_percentage(start, end, tuple(coord)),
+                coverage,
+            )
+
+    def test_batched_coverage_without_coordinates(self):
+        coverages = geomath.calculate_coverage_percentages(
+            (47, 8), (46, 7), [(np.nan, np.nan), (46, 7)]
+        )
+
+        self.assertTrue(np.isnan(coverages[0]))
+        self.assertAlmostEqual(coverages[1], 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import unittest
+from unittest.mock import patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app import http
+from app.containers import Container
+
+
+class CreateSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.session = http.create_session(
+            pool_connections=3, pool_maxsize=7, connect_timeout=2, read_timeout=9
+        )
+
+    def tearDown(self):
+        self.session.close()
+
+    def send(self, **kwargs):
+        request = requests.Request("GET", "http://localhost/locations").prepare()
+        with patch.object(HTTPAdapter, "send") as send:
+            self.session.get_adapter(request.url).send(request, **kwargs)
+        return send.call_args.kwargs
+
+    def test_default_timeout(self):
+        self.assertEqual(self.send()["timeout"], (2, 9))
+        self.assertEqual(self.send(timeout=None)["timeout"], (2, 9))
+
+    def test_explicit_timeout_is_kept(self):
+        self.assertEqual(self.send(timeout=1)["timeout"], 1)
+
+    def test_pool_sizes(self):
+        for url in ["http://localhost", "https://localhost"]:
+            adapter = self.session.get_adapter(url)
+            self.assertIsInstance(adapter, http.TimeoutHTTPAdapter)
+            self.assertEqual(adapter._pool_connections, 3)
+            self.assertEqual(adapter._pool_maxsize, 7)
+            self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 7)
+
+    def test_keep_alive(self):
+        self.assertNotEqual(self.session.headers.get("Connection"), "close")
+        session = http.create_session(keep_alive=False)
+        self.assertEqual(session.headers["Connection"], "close")
+        session.close()
+
+
+class SharedSessionTests(unittest.TestCase):
+    def setUp(self):
+        self.container = Container()
+        self.container.config.recording.mode.from_value("off")
+        self.container.config.http.pool_maxsize.from_value("4")
+
+    def tearDown(self):
+        self.container.shutdown_resources()
+
+    def test_services_share_the_session(self):
+        session = self.container.http_session()
+
+        self.assertEqual(session.get_adapter("https://localhost")._pool_maxsize, 4)
+        self.assertIs(self.container.transport_service().session, session)
+        self.assertIs(self.container.location_autocomplet_service().session, session)
+
+    def test_session_closed_on_shutdown(self):
+        with patch.object(requests.Session, "close") as close:
+            self.container.http_session()
+            self.container.shutdown_resources()
+
+        close.assert_called_once()
+
+
+class ContainerSelectorTests(unittest.TestCase):
+    def test_boolean_keys_are_normalized(self):
+        container = Container()
+        container.config.recording.mode.from_value(" Off ")
+        container.config.cache.connection_persist.from_value("no")
+        container.config.cache.route_persist.from_value("0")
+        container.config.router.geocoder_fallback.from_value("Yes")
+        container.config.router.speculative_sampling.from_value("1")
+        container.config.data.country_cache.from_value(":memory:")
+        self.addCleanup(container.shutdown_resources)
+
+        routing = container.routing_service()
+
+        self.assertIsNone(container.connection_cache())
+        self.assertIsNone(routing.route_cache)
+        self.assertIs(routing.geolocator, container.nominatim())
+        self.assertIs(routing.speculative_sampling, True)
+        self.assertIs(container.session(), container.http_session())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import gc
+import unittest
+
+from app.interning import InternRegistry, intern_string
+from app.models import Location
+
+
+def location(id, name="A"):
+    return Location(
+        id=id, type=None, name=name, score=None, coordinate=None, distance=None
+    )
+
+
+class InternRegistryTests(unittest.TestCase):
+    def test_equal_values_are_shared(self):
+        registry = InternRegistry()
+        first = registry.intern("1", location("1"))
+
+        self.assertIs(registry.intern("1", location("1")), first)
+        self.assertEqual(registry.hits, 1)
+
+    def test_changed_value_replaces_instance(self):
+        registry = InternRegistry()
+        registry.intern("1", location("1"))
+        renamed = registry.intern("1", location("1", name="B"))
+
+        self.assertIs(registry.intern("1", location("1", name="B")), renamed)
+
+    def test_unused_instances_are_released(self):
+        registry = InternRegistry()
+        registry.intern("1", location("1"))
+        gc.collect()
+
+        self.assertEqual(len(registry), 0)
+
+    def test_max_entries(self):
+        registry = InternRegistry(max_entries=1)
+        kept = registry.intern("1", location("1"))
+        other = location("2")
+
+        self.assertIs(registry.intern("2", other), other)
+        self.assertEqual(len(registry), 1)
+        self.assertIs(registry.intern("1", location("1")), kept)
+
+    def test_none_key_is_not_interned(self):
+        registry = InternRegistry()
+        value = location(None)
+
+        self.assertIs(registry.intern(None, value), value)
+        self.assertEqual(len(registry), 0)
+
+    def test_intern_string(self):
+        self.assertIs(intern_string("".join(["I", "C"])), intern_string("IC"))
+        self.assertIsNone(intern_string(None))
+        self.assertEqual(intern_string(5), 5)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import copy
+import pickle
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from app import models
+from app.services import TransportService
+
+
+class LazyListTests(unittest.TestCase):
+    def test_items_are_parsed_on_access(self):
+        parse = MagicMock(side_effect=lambda item: item * 2)
+        lazy = models.LazyList([1, 2, 3], parse)
+
+        self.assertEqual(len(lazy), 3)
+        parse.assert_not_called()
+
+        self.assertEqual(lazy[1], 4)
+        self.assertEqual(list(lazy), [2, 4, 6])
+        self.assertEqual(parse.call_count, 3)
+
+    def test_equality_and_copies(self):
+        lazy = models.LazyList([1, 2], lambda item: item)
+
+        self.assertEqual(lazy, [1, 2])
+        self.assertEqual(lazy, models.LazyList([1, 2], lambda item: item))
+        self.assertEqual(copy.deepcopy(lazy), [1, 2])
+        self.assertIsInstance(copy.deepcopy(lazy), list)
+
+    def test_concurrent_access(self):
+        lists = [
+            models.LazyList(list(range(50)), lambda item: item) for _ in range(200)
+        ]
+        barrier = threading.Barrier(4)
+        errors = []
+
+        def access():
+            barrier.wait()
+            try:
+                for lazy in lists:
+                    self.assertEqual(len(lazy), 50)
+                    self.assertEqual(lazy[49], 49)
+                    models.to_dict(lazy)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=access) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+    def test_to_dict_keeps_raw_data(self):
+        raw = [{"walk": {"duration": 60}}]
+        section_parse = MagicMock()
+        service = models.Service(regular=None, irregular=None)
+        connection = models.Connection(
+            _from=None,
+            to=None,
+            duration="00d00:01:00",
+            service=service,
+            products=["IC"],
+            transfers=0,
+            capacity1st=None,
+            capacity2nd=None,
+            sections=models.LazyList(raw, section_parse),
+        )
+
+        data = models.to_dict(connection)
+
+        self.assertIs(data["sections"], raw)
+        self.assertEqual(data["service"], {"regular": None, "irregular": None})
+        section_parse.assert_not_called()
+
+
+def parsed_connection():
+    return TransportService("http://localhost").parse_connection(
+        {
+            "from": {
+                "station": {"id": "1", "name": "Zürich HB"},
+                "departureTimestamp": 1682928000,
+            },
+            "to": {
+                "station": {"id": "2", "name": "Basel SBB"},
+                "arrivalTimestamp": 1682933400,
+            },
+            "duration": "00d01:30:00",
+            "transfers": 0,
+            "sections": [{"journey": {"name": "IC 3"}}, {"walk": {"duration": 60}}],
+        }
+    )
+
+
+class RouteModelTests(unittest.TestCase):
+    def test_route_connection_round_trip(self):
+        connection = parsed_connection()
+
+        route_connection = models.RouteConnection(
+            direct_connection=False,
+            coverage=0.5,
+            providers=[],
+            **models.fields_of(connection),
+        )
+        fields = models.fields_of(route_connection)
+
+        self.assertEqual(fields.pop("direct_connection"), False)
+        self.assertEqual(fields.pop("coverage"), 0.5)
+        self.assertEqual(fields.pop("service_end_country"), "CH")
+        self.assertEqual(fields.pop("providers"), [])
+        self.assertIsNone(fields.pop("projection"))
+        self.assertEqual(fields, models.fields_of(connection))
+        self.assertEqual(models.Connection(**fields), connection)
+        # The sections are handed over unparsed
+        self.assertIs(route_connection.sections, connection.sections)
+        self.assertIsNone(route_connection.sections.items)
+
+    def test_route_location_round_trip(self):
+        location = parsed_connection().to.station
+
+        route_location = models.RouteLocation(
+            country="ch", **models.fields_of(location)
+        )
+        fields = models.fields_of(route_location)
+
+        self.assertEqual(fields.pop("country"), "ch")
+        self.assertEqual(models.Location(**fields), location)
+        self.assertEqual(route_location.name, "Basel SBB")
+
+    def test_lazy_fields_survive_copy(self):
+        connection = parsed_connection()
+
+        shallow = copy.copy(connection)
+        deep = copy.deepcopy(connection)
+
+        self.assertIs(shallow.sections, connection.sections)
+        self.assertEqual(deep.sections, connection.sections)
+        self.assertEqual(deep.sections[0].journey.name, "IC 3")
+        self.assertEqual(deep.sections[1].walk, {"duration": 60})
+
+    def test_lazy_fields_survive_pickle(self):
+        connection = models.RouteConnection(
+            coverage=0.5, **models.fields_of(parsed_connection())
+        )
+
+        restored = pickle.loads(pickle.dumps(connection))
+
+        self.assertEqual(restored, connection)
+        self.assertIsInstance(restored.sections, list)
+        self.assertEqual(restored.sections[0].journey.name, "IC 3")
+        self.assertEqual(restored.coverage, 0.5)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import unittest
+
+from app.ratelimit import AdaptiveRateLimiter
+
+
+class AdaptiveRateLimiterTests(unittest.TestCase):
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter(
+            rate=1000,
+            burst=100,
+            initial_concurrency=4,
+            min_concurrency=1,
+            max_concurrency=8,
+            slow_threshold=1,
+        )
+
+    def test_concurrency_limit(self):
+        for _ in range(4):
+            self.assertEqual(self.limiter.try_acquire(), 0)
+        self.assertIsNone(self.limiter.try_acquire())
+        self.assertEqual(self.limiter.stats()["in_flight"], 4)
+
+        self.limiter.release(200, 0.1)
+        self.assertEqual(self.limiter.try_acquire(), 0)
+
+    def test_token_bucket(self):
+        limiter = AdaptiveRateLimiter(rate=1, burst=1, initial_concurrency=4)
+        self.assertEqual(limiter.try_acquire(), 0)
+        self.assertGreater(limiter.try_acquire(), 0)
+
+    def test_additive_increase(self):
+        for _ in range(20):
+            with self.limiter.slot() as slot:
+                slot.status = 200
+        self.assertGreater(self.limiter.stats()["concurrency_limit"], 4)
+
+    def test_multiplicative_decrease(self):
+        with self.limiter.slot() as slot:
+            slot.status = 429
+        self.assertEqual(self.limiter.stats()["concurrency_limit"], 2)
+
+        # Further failures within the same window do not collapse the limit
+        with self.limiter.slot() as slot:
+            slot.status = 503
+        self.assertEqual(self.limiter.stats()["concurrency_limit"], 2)
+
+    def test_network_errors_back_off(self):
+        with self.assertRaises(ConnectionError):
+            with self.limiter.slot():
+                raise ConnectionError()
+        self.assertEqual(self.limiter.stats()["concurrency_limit"], 2)
+        self.assertEqual(self.limiter.stats()["in_flight"], 0)
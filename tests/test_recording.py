@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from app import recording
+from app.services import TransportService
+
+
+class RecordingTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.corpus = recording.RecordingCorpus(os.path.join(directory, "corpus.jsonl"))
+
+    def record_locations(self):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = (
+            b'{"stations": [{"id": "8503000", "name": "Z\\u00fcrich HB"}]}'
+        )
+        session = MagicMock()
+        session.get.return_value = response
+
+        transport = TransportService(
+            "http://localhost", recording.RecordingSession(session, self.corpus)
+        )
+        return transport.search_locations("Zürich")
+
+    def test_record_and_replay(self):
+        recorded = self.record_locations()
+
+        transport = TransportService(
+            "http://localhost", recording.ReplaySession(self.corpus)
+        )
+        replayed = transport.search_locations("Zürich")
+
+        self.assertEqual(recorded, replayed)
+        self.assertEqual(replayed[0].name, "Zürich HB")
+
+    def test_replay_miss(self):
+        self.record_locations()
+
+        transport = TransportService(
+            "http://localhost", recording.ReplaySession(self.corpus)
+        )
+        with self.assertRaises(recording.ReplayMissError):
+            transport.search_locations("Bern")
+
+    def test_geolocator(self):
+        geolocator = MagicMock()
+        geolocator.reverse.return_value = MagicMock(
+            raw={"lat": "47.1", "lon": "8.2", "address": {"country_code": "ch"}}
+        )
+        recording.RecordingGeolocator(geolocator, self.corpus).reverse("47.1, 8.2")
+
+        location = recording.ReplayGeolocator(self.corpus).reverse("47.1, 8.2")
+
+        self.assertEqual(location.raw["address"]["country_code"], "ch")
+        self.assertEqual(location.latitude, 47.1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import unittest
+from unittest.mock import MagicMock
+
+from app.models import RouteLocation, RoutingParameters, fields_of
+from app.services import RouteCacheService, RoutingService, TransportService
+from app.store import PersistentCache
+from .fixtures import connection, location
+
+
+class FakeBlacklist:
+    def __init__(self):
+        self.pairs = set()
+
+    def check_blacklist(self, start, dest):
+        return (start, dest) in self.pairs
+
+
+class FakeForeignProviders:
+    def __init__(self):
+        self.value = "a"
+
+    def fingerprint(self):
+        return self.value
+
+
+class RouteCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.transport = TransportService("http://localhost")
+        self.store = PersistentCache(":memory:")
+        self.blacklist = FakeBlacklist()
+        self.foreign_providers = FakeForeignProviders()
+        self.cache = RouteCacheService(
+            self.store,
+            self.transport,
+            blacklist=self.blacklist,
+            foreign_providers=self.foreign_providers,
+            bucket_seconds=900,
+        )
+        self.start = location("Station 1", 47.0, 9.0)
+        self.destination = location("Station 3", 47.0, 1.0)
+        self.routing = RoutingService(
+            MagicMock(),
+            MagicMock(),
+            MagicMock(get=MagicMock(return_value=None)),
+            50,
+            1000,
+            route_cache=self.cache,
+        )
+
+    def tearDown(self):
+        self.store.close()
+
+    def indirect_route(self):
+        stations = [
+            RouteLocation(country="fr", **fields_of(location("Station 2", 47.0, 5.0)))
+        ]
+        connections = self.transport.parse_connections(
+            {
+                "connections": [
+                    connection(
+                        self.start,
+                        stations[0],
+                        "2023-05-01T10:00:00+0200",
+                        "2023-05-01T11:30:00+0200",
+                        duration="00d01:30:00",
+                        transfers=1,
+                        sections=[{"journey": {"name": "IC 1"}}],
+                    )
+                ]
+            }
+        )
+        return self.routing.build_indirect_route(
+            self.start, self.destination, stations, [connections]
+        )
+
+    def test_round_trip(self):
+        route = self.indirect_route()
+        key = self.cache.key("Start", "Destination", 50, 1000)
+
+        self.cache.set(key, route, "Start", "Destination")
+        cached = self.cache.get(key)
+
+        self.assertEqual(cached, route)
+        self.assertEqual(cached.connections[0].sections[0].journey.name, "IC 1")
+        self.assertEqual(cached.connections[0].projection, RoutingService.PROJECTION)
+
+    def test_key_is_normalized(self):
+        self.assertEqual(
+            self.cache.key(" Zürich  HB", "Bern", 50, 1000),
+            self.cache.key("zürich hb", "bern", 50, 1000),
+        )
+        self.assertNotEqual(
+            self.cache.key("Zürich HB", "Bern", 50, 1000),
+            self.cache.key("Zürich HB", "Bern", 20, 1000),
+        )
+
+    def test_time_buckets(self):
+        self.assertEqual(
+            self.cache.key("a", "b", 50, 1000, now=900),
+            self.cache.key("a", "b", 50, 1000, now=1799),
+        )
+        self.assertNotEqual(
+            self.cache.key("a", "b", 50, 1000, now=1799),
+            self.cache.key("a", "b", 50, 1000, now=1800),
+        )
+
+    def test_settings_are_part_of_the_key(self):
+        self.assertNotEqual(
+            self.cache.key("a", "b", 50, 1000, settings=["uniform", "parallel"]),
+            self.cache.key("a", "b", 50, 1000, settings=["adaptive", "parallel"]),
+        )
+
+    def test_routing_key_contains_settings(self):
+        params = RoutingParameters(start="a", destination="b")
+        key = self.routing.route_key(params)
+
+        for name, value in [
+            ("sampling", "adaptive"),
+            ("probe_strategy", "search"),
+            ("coverage_threshold", 0.5),
+        ]:
+            default = getattr(self.routing, name)
+            setattr(self.routing, name, value)
+            self.assertNotEqual(self.routing.route_key(params), key, name)
+            setattr(self.routing, name, default)
+
+        self.assertEqual(self.routing.route_key(params), key)
+
+    def test_blacklisting_a_dependency_invalidates(self):
+        key = self.cache.key("a", "b", 50, 1000)
+        self.cache.set(key, self.indirect_route(), "a", "b")
+
+        self.blacklist.pairs.add(("a", "other"))
+        self.assertIsNotNone(self.cache.get(key))
+
+        self.blacklist.pairs.add(("a", "Station 2"))
+        self.assertIsNone(self.cache.get(key))
+
+    def test_unblacklisting_a_dependency_invalidates(self):
+        self.blacklist.pairs.add(("a", "b"))
+        key = self.cache.key("a", "b", 50, 1000)
+        self.cache.set(key, self.indirect_route(), "a", "b")
+
+        self.blacklist.pairs.clear()
+
+        self.assertIsNone(self.cache.get(key))
+
+    def test_providers_change_invalidates(self):
+        self.cache.set(
+            self.cache.key("a", "b", 50, 1000), self.indirect_route(), "a", "b"
+        )
+
+        self.foreign_providers.value = "b"
+
+        self.assertIsNone(self.cache.get(self.cache.key("a", "b", 50, 1000)))
+
+    def test_routing_memoizes_routes(self):
+        route = self.indirect_route()
+        self.routing.find_route = MagicMock(return_value=route)
+        params = RoutingParameters(start="Start", destination="Destination")
+
+        self.routing.route(params)
+        cached = self.routing.route(params)
+
+        self.assertEqual(self.routing.find_route.call_count, 1)
+        self.assertEqual(cached, route)
+
+    def test_no_connection_is_not_memoized(self):
+        route = self.indirect_route()
+        route.found_connection = False
+        self.routing.find_route = MagicMock(return_value=route)
+        params = RoutingParameters(start="Start", destination="Destination")
+
+        self.routing.route(params)
+        self.routing.route(params)
+
+        self.assertEqual(self.routing.find_route.call_count, 2)
+
+    def test_failed_probes_are_not_memoized(self):
+        route = self.indirect_route()
+        self.routing.transport.get_connections.side_effect = RuntimeError("429")
+
+        def find_route(params, callback=None):
+            self.routing.probe_station(params.start, route.connecting_stations[0])
+            return route
+
+        self.routing.find_route = MagicMock(side_effect=find_route)
+        params = RoutingParameters(start="Start", destination="Destination")
+
+        with self.assertLogs(level="WARNING"):
+            self.routing.route(params)
+            self.routing.route(params)
+
+        self.assertEqual(self.routing.find_route.call_count, 2)
+        self.assertEqual(self.routing.stats()["failed_probes"], 2)
+
+    def test_other_trips_keep_the_route(self):
+        route = self.indirect_route()
+
+        def find_route(params, callback=None):
+            # Probing blacklists the connections without results
+            self.blacklist.pairs.add((params.start, "Elsewhere"))
+            self.blacklist.pairs.add(("Other", params.destination))
+            return route
+
+        self.routing.find_route = MagicMock(side_effect=find_route)
+        trip_a = RoutingParameters(start="Start", destination="Destination")
+        trip_b = RoutingParameters(start="Start", destination="Somewhere")
+
+        self.routing.route(trip_a)
+        self.routing.route(trip_b)
+        cached = self.routing.route(trip_a)
+
+        self.assertEqual(self.routing.find_route.call_count, 2)
+        self.assertEqual(cached, route)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from app import utils
+from app.models import RouteLocation, fields_of
+from app.services import RoutingService, TransportService
+from .fixtures import FakeTransportService, connection, location
+
+
+class ProbingTests(unittest.TestCase):
+    def setUp(self):
+        self.start = location("start", 47.0, 9.0)
+        self.destination = location("destination", 47.0, 1.0)
+        # Closest to the destination first, like find_connecting_stations
+        self.stations = [
+            RouteLocation(country="ch", **fields_of(location(f"s{lon}", 47.0, lon)))
+            for lon in range(2, 9)
+        ]
+        self.transport = FakeTransportService([self.start, *self.stations], delay=0.01)
+
+    def routing(self, **kwargs):
+        return RoutingService(
+            MagicMock(), self.transport, MagicMock(), 50, 1000, **kwargs
+        )
+
+    def probe(self, routing, on_progress=None):
+        return routing.probe_connecting_stations(
+            "start", self.start, self.destination, self.stations, on_progress
+        )
+
+    def test_probes_every_station_below_threshold(self):
+        progress = []
+
+        results = self.probe(
+            self.routing(probe_workers=3, coverage_threshold=2),
+            lambda total, step: progress.append((total, step)),
+        )
+
+        self.assertEqual(
+            sorted(self.transport.probed), sorted(s.name for s in self.stations)
+        )
+        self.assertEqual([len(connections) for connections in results], [1] * 7)
+        self.assertEqual(
+            [results[i][0].to.station.name for i in range(7)],
+            [station.name for station in self.stations],
+        )
+        self.assertEqual(progress, [(7, step) for step in range(1, 8)])
+
+    def test_cancels_remaining_probes_at_threshold(self):
+        # s2 covers 7/8 of the distance
+        results = self.probe(self.routing(probe_workers=1, coverage_threshold=0.8))
+
+        # The single worker may have started the next probe before the cancel
+        self.assertEqual(self.transport.probed[0], "s2")
+        self.assertLessEqual(len(self.transport.probed), 2)
+        self.assertEqual(len(results), 7)
+        self.assertEqual([len(connections) for connections in results[1:]], [0] * 6)
+
+    def test_waits_for_running_probes(self):
+        self.transport.delay = 0.05
+
+        self.probe(self.routing(probe_workers=3, coverage_threshold=0.8))
+        probed = list(self.transport.probed)
+        time.sleep(0.1)
+
+        self.assertEqual(self.transport.probed, probed)
+
+    def test_failed_probe_gives_no_connections(self):
+        self.transport.failing = {"s4"}
+
+        with self.assertLogs(level="WARNING"):
+            results = self.probe(self.routing(probe_workers=3, coverage_threshold=2))
+
+        self.assertEqual(
+            [len(connections) for connections in results], [1, 1, 0, 1, 1, 1, 1]
+        )
+
+    def test_async_failed_probe_gives_no_connections(self):
+        self.transport.failing = {"s4"}
+
+        results = asyncio.run(
+            self.routing(
+                probe_workers=3, coverage_threshold=2
+            ).probe_connecting_stations_async(
+                "start", self.start, self.destination, self.stations
+            )
+        )
+
+        self.assertEqual(
+            [len(connections) for connections in results], [1, 1, 0, 1, 1, 1, 1]
+        )
+
+    def test_async_cancels_remaining_probes_at_threshold(self):
+        progress = []
+
+        results = asyncio.run(
+            self.routing(
+                probe_workers=1, coverage_threshold=0.8
+            ).probe_connecting_stations_async(
+                "start",
+                self.start,
+                self.destination,
+                self.stations,
+                lambda total, step: progress.append((total, step)),
+            )
+        )
+
+        self.assertEqual(self.transport.probed, ["s2"])
+        self.assertEqual(len(results[0]), 1)
+        self.assertEqual(progress, [(7, 1)])
+
+
+class IndirectRouteTests(unittest.TestCase):
+    def test_station_without_coordinates(self):
+        start = location("start", 47.0, 9.0)
+        stations = [
+            RouteLocation(country="fr", **fields_of(location("s2", 47.0, 2.0))),
+            RouteLocation(country="fr", **fields_of(location("s5", 47.0, 5.0))),
+        ]
+        parser = TransportService("http://localhost")
+        without_coordinates = connection(start, stations[0])
+        del without_coordinates["to"]["station"]["coordinate"]
+        results = [
+            parser.parse_connections({"connections": [without_coordinates]}),
+            parser.parse_connections({"connections": [connection(start, stations[1])]}),
+        ]
+        routing = RoutingService(
+            MagicMock(), MagicMock(), MagicMock(get=lambda country: None), 50, 1000
+        )
+
+        route = routing.build_indirect_route(
+            start, location("destination", 47.0, 1.0), stations, results
+        )
+
+        unknown = route.connections[0]
+        self.assertEqual(unknown.coverage, 0)
+        self.assertEqual([p.coverage for p in unknown.providers], [0, 1])
+        self.assertEqual(utils.parse_procent(unknown.coverage), "0%")
+        self.assertEqual(route.best_coverage_station, "s5")
+
+
+class SearchTests(unittest.TestCase):
+    def setUp(self):
+        self.start = location("start", 47.0, 9.0)
+        self.stations = [
+            RouteLocation(
+                country="ch", **fields_of(location(f"s{i}", 47.0, 1 + i * 0.1))
+            )
+            for i in range(64)
+        ]
+
+    def search(self, first_reachable, **kwargs):
+        self.transport = FakeTransportService(
+            [self.start, *self.stations],
+            unreachable=[station.name for station in self.stations[:first_reachable]],
+        )
+        self.routing = RoutingService(
+            MagicMock(),
+            self.transport,
+            MagicMock(),
+            50,
+            1000,
+            probe_strategy="search",
+            **kwargs,
+        )
+        return self.routing.probe_connecting_stations(
+            "start", self.start, None, self.stations
+        )
+
+    def reachable(self, results):
+        return [i for i, connections in enumerate(results) if connections]
+
+    def test_finds_first_reachable_station(self):
+        for first_reachable in [0, 1, 2, 5, 17, 40, 63]:
+            results = self.search(first_reachable)
+
+            self.assertEqual(min(self.reachable(results)), first_reachable)
+            self.assertLessEqual(len(self.transport.probed), 2 * 6 + 2)
+            self.assertEqual(
+                self.routing.stats(),
+                {
+                    "probes": len(self.transport.probed),
+                    "probes_saved": 64 - len(self.transport.probed),
+                    "failed_probes": 0,
+                },
+            )
+
+    def test_no_reachable_station(self):
+        results = self.search(64)
+
+        self.assertEqual(self.reachable(results), [])
+        self.assertEqual(
+            self.transport.probed, [f"s{i}" for i in [0, 1, 3, 7, 15, 31, 63]]
+        )
+
+    def search_non_monotone(self, search_verify):
+        # s30 is reachable although s31 is not, the binary search lands on s32
+        self.search(32, search_verify=search_verify)
+        self.transport.unreachable.discard("s30")
+        self.transport.probed.clear()
+
+        return self.routing.probe_connecting_stations(
+            "start", self.start, None, self.stations
+        )
+
+    def test_verifies_neighbours(self):
+        results = self.search_non_monotone(search_verify=2)
+
+        self.assertEqual(min(self.reachable(results)), 30)
+        # s31 is known from galloping, it is not probed again nor counted
+        self.assertEqual(self.transport.probed[-2:], ["s30", "s29"])
+
+    def test_verifies_one_neighbour(self):
+        self.assertEqual(min(self.reachable(self.search_non_monotone(0))), 32)
+        probes = len(self.transport.probed)
+
+        self.assertEqual(min(self.reachable(self.search_non_monotone(1))), 30)
+        self.assertEqual(len(self.transport.probed), probes + 1)
+
+    def test_async_probes_the_same_stations(self):
+        self.search(17)
+        probed = list(self.transport.probed)
+        self.transport.probed.clear()
+
+        results = asyncio.run(
+            self.routing.probe_connecting_stations_async(
+                "start", self.start, None, self.stations
+            )
+        )
+
+        self.assertEqual(self.transport.probed, probed)
+        self.assertEqual(min(self.reachable(results)), 17)
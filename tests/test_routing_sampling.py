@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from haversine import haversine
+
+from app.models import RoutingConnectingStationsParams
+from app.services import RoutingService
+from .fixtures import BORDER, FakeCountryIndex, FakeTransportService, location
+
+
+class AdaptiveSamplingTests(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeTransportService(stations_from=3)
+        self.routing = RoutingService(
+            MagicMock(),
+            self.transport,
+            MagicMock(),
+            50,
+            1000,
+            country_index=FakeCountryIndex(),
+        )
+        self.params = RoutingConnectingStationsParams(
+            start=location("start", 47.0, 9.0),
+            destination=location("destination", 47.0, 1.0),
+            steps=50,
+            stop_at=100,
+            sampling="adaptive",
+            coarse_steps=8,
+            resolution=5,
+        )
+
+    def assert_border_found(self, stations):
+        swiss = [s for s in stations if s.country == "ch"]
+        french = [s for s in stations if s.country == "fr"]
+        # The last stations before and after the border are close to it
+        self.assertLess(haversine((47.0, BORDER), (47.0, swiss[0].coordinate.y)), 5)
+        self.assertLess(haversine((47.0, BORDER), (47.0, french[-1].coordinate.y)), 5)
+
+    def test_refines_at_border_and_station_gap(self):
+        stations = self.routing.find_connecting_stations(self.params)
+
+        self.assertLess(self.transport.searches, 50)
+        self.assert_border_found(stations)
+        # The first station after the gap without stations is close to it
+        self.assertLess(
+            haversine((47.0, 3.0), (47.0, stations[0].coordinate.y)),
+            5,
+        )
+
+    def test_async_samples_the_same_points(self):
+        stations = self.routing.find_connecting_stations(self.params)
+        searches = self.transport.searches
+
+        async_stations = asyncio.run(
+            self.routing.find_connecting_stations_async(self.params)
+        )
+
+        self.assertEqual(self.transport.searches, 2 * searches)
+        self.assertEqual(async_stations, stations)
+
+    def test_async_reports_progress_per_sample(self):
+        progress = []
+
+        asyncio.run(
+            self.routing.find_connecting_stations_async(
+                self.params, lambda total, step: progress.append((total, step))
+            )
+        )
+
+        # Each round extends the total by the points it samples
+        self.assertEqual(
+            [step for _, step in progress], list(range(1, len(progress) + 1))
+        )
+        self.assertEqual(progress[0], (self.params.coarse_steps, 1))
+        self.assertLess(progress[0][0], progress[-1][0])
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+    def test_uniform_sampling(self):
+        self.params.sampling = "uniform"
+
+        self.routing.find_connecting_stations(self.params)
+
+        self.assertEqual(self.transport.searches, 50)
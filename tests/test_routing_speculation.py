@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from app.models import RoutingParameters
+from app.services import RoutingService, RoutingProgressEnum
+from . import fixtures
+from .fixtures import FakeCountryIndex, location
+
+STATIONS = [location("start", 47.0, 9.0), location("destination", 47.0, 1.0)]
+
+
+class FakeTransportService(fixtures.FakeTransportService):
+    """The start, destination and direct lookups wait for each other
+
+    The direct connection is only answered once the connecting stations are
+    sampled, or after a timeout when nobody samples them.
+    """
+
+    def __init__(self, direct=False):
+        super().__init__(STATIONS)
+        self.direct = direct
+        self.bootstrap = threading.Barrier(3, timeout=2)
+        self.sampling = threading.Event()
+        self.sampled_before_direct = None
+
+    def search_locations(self, query=None, x=None, y=None, **kwargs):
+        if query is not None:
+            self.bootstrap.wait()
+        else:
+            self.sampling.set()
+        return super().search_locations(query, x, y, **kwargs)
+
+    def get_connections(self, departure, arrival, **kwargs):
+        if arrival != "destination":
+            return []
+        self.bootstrap.wait()
+        self.sampled_before_direct = self.sampling.wait(timeout=0.5)
+        if not self.direct:
+            return []
+        return self.connections(departure, arrival)
+
+
+class AsyncFakeTransportService(fixtures.FakeTransportService):
+    """Same as FakeTransportService on the event loop"""
+
+    def __init__(self, direct=False):
+        super().__init__(STATIONS)
+        self.direct = direct
+        self.sampling = asyncio.Event()
+        self.sampled_before_direct = None
+
+    async def search_locations_async(self, query=None, x=None, y=None, **kwargs):
+        if query is None:
+            self.sampling.set()
+        return self.search_locations(query, x, y, **kwargs)
+
+    async def get_connections_async(self, departure, arrival, **kwargs):
+        if arrival != "destination":
+            return []
+        try:
+            await asyncio.wait_for(self.sampling.wait(), timeout=0.5)
+            self.sampled_before_direct = True
+        except asyncio.TimeoutError:
+            self.sampled_before_direct = False
+        if not self.direct:
+            return []
+        return self.connections(departure, arrival)
+
+
+class SpeculativeSamplingTests(unittest.TestCase):
+    def routing(self, transport, **kwargs):
+        return RoutingService(
+            MagicMock(),
+            transport,
+            MagicMock(),
+            10,
+            1000,
+            country_index=FakeCountryIndex(),
+            **kwargs,
+        )
+
+    def test_bootstrap_runs_concurrently(self):
+        transport = FakeTransportService(direct=True)
+
+        route = self.routing(transport).route(
+            RoutingParameters(start="start", destination="destination")
+        )
+
+        self.assertTrue(route.found_connection)
+        self.assertTrue(route.only_direct_routes)
+        self.assertFalse(transport.sampled_before_direct)
+
+    def test_samples_speculatively_for_foreign_destination(self):
+        transport = FakeTransportService()
+        progress = []
+
+        route = self.routing(transport, speculative_sampling=True).route(
+            RoutingParameters(start="start", destination="destination"),
+            lambda state, *args: progress.append(state),
+        )
+
+        self.assertTrue(transport.sampled_before_direct)
+        self.assertFalse(route.found_connection)
+        self.assertIn(RoutingProgressEnum.FINDING_CONNECTING_STATIONS, progress)
+
+    def test_no_speculation_for_swiss_destination(self):
+        transport = FakeTransportService()
+        routing = self.routing(transport, speculative_sampling=True)
+        routing.country_index = MagicMock(get_country=MagicMock(return_value="ch"))
+
+        routing.route(RoutingParameters(start="start", destination="destination"))
+
+        self.assertFalse(transport.sampled_before_direct)
+
+    def test_async_samples_speculatively(self):
+        transport = AsyncFakeTransportService(direct=True)
+
+        route = asyncio.run(
+            self.routing(transport, speculative_sampling=True).route_async(
+                RoutingParameters(start="start", destination="destination")
+            )
+        )
+
+        self.assertTrue(transport.sampled_before_direct)
+        self.assertTrue(route.only_direct_routes)
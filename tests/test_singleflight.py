@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from app.singleflight import SingleFlight, AsyncSingleFlight
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_calls_are_shared(self):
+        flight = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(4)
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return ["result"]
+
+        def call():
+            barrier.wait()
+            return flight.do("key", fetch)
+
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda _: call(), range(4)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.shared, 3)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_exceptions_are_shared(self):
+        flight = SingleFlight()
+
+        def fetch():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", fetch)
+        self.assertEqual(flight.in_flight(), 0)
+
+
+class AsyncSingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_are_shared(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            flight.do("a", fetch, 1), flight.do("a", fetch, 1), flight.do("b", fetch, 2)
+        )
+
+        self.assertEqual(results, [1, 1, 2])
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(flight.in_flight(), 0)
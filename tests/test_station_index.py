@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from haversine import haversine
+
+from app import stations
+from app.services import StationIndexService, RoutingService
+
+STOPS = """stop_id,stop_name,stop_lat,stop_lon,location_type,parent_station
+Parent8503000,Zürich HB,47.378177,8.540212,1,
+8503000:0:3,Zürich HB,47.377847,8.540502,,Parent8503000
+8503006,Zürich Oerlikon,47.411526,8.544115,,
+8506000,Winterthur,47.500331,8.723822,,
+8507000,Bern,46.948825,7.439122,,
+"""
+
+
+class StationIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        source = os.path.join(self.directory.name, "stops.txt")
+        with open(source, "w", encoding="utf-8") as file:
+            file.write(STOPS)
+        self.path = os.path.join(self.directory.name, "stations.npz")
+        self.imported = stations.import_stops(source, self.path)
+        self.index = StationIndexService(self.path, max_distance=5000, limit=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_platforms_are_merged_into_stations(self):
+        self.assertEqual(self.imported, 4)
+        self.assertEqual(len(self.index), 4)
+
+    def test_nearest_stations(self):
+        locations = self.index.search_locations(47.40, 8.54)
+
+        self.assertEqual(
+            [location.id for location in locations], ["8503006", "8503000"]
+        )
+        self.assertEqual(locations[0].type, "station")
+        self.assertAlmostEqual(
+            locations[0].distance,
+            haversine((47.40, 8.54), (47.411526, 8.544115)) * 1000,
+            delta=1,
+        )
+
+    def test_uncovered_point(self):
+        self.assertIsNone(self.index.search_locations(45.0, 9.0))
+
+    def test_missing_index(self):
+        index = StationIndexService(os.path.join(self.directory.name, "missing.npz"))
+
+        self.assertEqual(len(index), 0)
+        self.assertIsNone(index.search_locations(47.40, 8.54))
+
+    def test_routing_falls_back_to_the_api(self):
+        transport = MagicMock()
+        transport.search_locations.return_value = []
+        routing = RoutingService(
+            MagicMock(), transport, MagicMock(), 10, 1000, station_index=self.index
+        )
+
+        self.assertEqual(routing.search_stations((47.40, 8.54))[0].id, "8503006")
+        transport.search_locations.assert_not_called()
+
+        self.assertEqual(routing.search_stations((45.0, 9.0)), [])
+        transport.search_locations.assert_called_once()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import unittest
+from unittest.mock import patch
+
+from app.store import PersistentCache
+
+
+class PersistentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = PersistentCache(":memory:", max_entries=2)
+
+    def tearDown(self):
+        self.cache.close()
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get("A"))
+        self.cache.set("A", "value", ttl=60)
+        self.assertEqual(self.cache.get("A"), "value")
+
+    def test_expired_entries(self):
+        with patch("app.store.time.time", return_value=1000):
+            self.cache.set("A", "value", ttl=10)
+        with patch("app.store.time.time", return_value=1011):
+            self.assertIsNone(self.cache.get("A"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_least_recently_used_is_evicted(self):
+        with patch("app.store.time.time", return_value=1000):
+            self.cache.set("A", "a", ttl=60)
+        with patch("app.store.time.time", return_value=1001):
+            self.cache.set("B", "b", ttl=60)
+        with patch("app.store.time.time", return_value=1002):
+            self.cache.get("A")
+        with patch("app.store.time.time", return_value=1003):
+            self.cache.set("C", "c", ttl=60)
+
+            self.assertEqual(len(self.cache), 2)
+            self.assertEqual(self.cache.get("A"), "a")
+            self.assertIsNone(self.cache.get("B"))
+            self.assertEqual(self.cache.get("C"), "c")
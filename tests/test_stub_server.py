@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+
+from app import http
+from app.recording import RecordingCorpus, request_url
+from app.services import TransportService
+from benchmarks.stub_server import LatencyDistribution, StubTransportServer, project
+
+
+class StubServerTests(unittest.TestCase):
+    def setUp(self):
+        self.session = http.create_session()
+        self.serve()
+
+    def tearDown(self):
+        self.session.close()
+
+    def serve(self, **kwargs):
+        self.server = StubTransportServer(("127.0.0.1", 0), **kwargs)
+        threading.Thread(
+            target=self.server.serve_forever, args=(0.01,), daemon=True
+        ).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.transport_service = TransportService(self.url, session=self.session)
+
+    def test_locations(self):
+        locations = self.transport_service.search_locations("Zürich HB")
+
+        self.assertGreater(len(locations), 0)
+        self.assertEqual(locations[0].name, "Zürich HB")
+        self.assertIsNotNone(locations[0].coordinate.x)
+
+    def test_connections(self):
+        connections = self.transport_service.get_connections(
+            "Zürich HB", "Basel SBB", limit=3
+        )
+
+        self.assertEqual(len(connections), 3)
+        for connection in connections:
+            self.assertEqual(connection._from.station.name, "Zürich HB")
+            self.assertEqual(connection.to.station.name, "Basel SBB")
+            self.assertIsNotNone(connection._from.departure)
+            self.assertGreater(len(connection.sections), 0)
+
+    def test_projected_connections(self):
+        connections = self.transport_service.get_connections(
+            "Zürich HB", "Basel SBB", projection="routing-probe"
+        )
+
+        self.assertGreater(len(connections), 0)
+        self.assertEqual(connections[0].to.station.name, "Basel SBB")
+        self.assertEqual(connections[0].sections, [])
+        self.assertEqual(self.server.stats["requests"], 1)
+
+    def test_fields_projection(self):
+        response = self.session.get(
+            self.url + "/connections",
+            params={
+                "from": "A",
+                "to": "B",
+                "fields[]": ["connections/from/station/name", "connections/duration"],
+            },
+        )
+        data = response.json()
+
+        self.assertEqual(list(data), ["connections"])
+        for connection in data["connections"]:
+            self.assertEqual(set(connection), {"from", "duration"})
+            self.assertEqual(connection["from"], {"station": {"name": "A"}})
+
+    def test_throttling(self):
+        self.serve(throttle_rate=1)
+
+        response = self.session.get(self.url + "/locations", params={"query": "A"})
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("errors", response.json())
+        self.assertEqual(self.server.stats["throttled"], 1)
+
+    def test_errors(self):
+        self.serve(error_rate=1)
+
+        response = self.session.get(self.url + "/connections", params={"from": "A"})
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.server.stats["errors"], 1)
+
+    def test_rates_are_seeded(self):
+        counts = []
+        for _ in range(2):
+            self.serve(throttle_rate=0.2, error_rate=0.3, seed=7)
+            for _ in range(40):
+                self.session.get(self.url + "/locations", params={"query": "A"})
+            counts.append(dict(self.server.stats))
+
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(counts[0]["requests"], 40)
+        self.assertGreater(counts[0]["throttled"], 0)
+        self.assertGreater(counts[0]["errors"], 0)
+
+    def test_latency(self):
+        self.serve(latency=LatencyDistribution("fixed:0.1"))
+
+        started = time.monotonic()
+        self.transport_service.search_locations("A")
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+    def test_recorded_corpus(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corpus = RecordingCorpus(os.path.join(directory, "corpus.jsonl"))
+            corpus.append(
+                {
+                    "kind": "http",
+                    "url": request_url(
+                        "https://transport.opendata.ch/v1/locations",
+                        self.transport_service.location_params("Bern"),
+                    ),
+                    "status": 200,
+                    "body": json.dumps({"stations": [{"id": "1", "name": "Recorded"}]}),
+                    "elapsed": 0.1,
+                }
+            )
+            self.serve(corpus=corpus)
+
+        recorded = self.transport_service.search_locations("Bern")
+        synthetic = self.transport_service.search_locations("Basel")
+
+        self.assertEqual([location.name for location in recorded], ["Recorded"])
+        self.assertEqual(synthetic[0].name, "Basel")
+        self.assertEqual(self.server.stats["recorded"], 1)
+
+    def test_unknown_endpoint(self):
+        response = self.session.get(self.url + "/stationboard")
+
+        self.assertEqual(response.status_code, 404)
+
+
+class LatencyDistributionTests(unittest.TestCase):
+    def samples(self, spec):
+        rng = random.Random(1)
+        return [LatencyDistribution(spec).sample(rng) for _ in range(1000)]
+
+    def test_fixed(self):
+        self.assertEqual(set(self.samples("fixed:0.2")), {0.2})
+
+    def test_uniform(self):
+        samples = self.samples("uniform:0.05:0.3")
+
+        self.assertGreaterEqual(min(samples), 0.05)
+        self.assertLessEqual(max(samples), 0.3)
+
+    def test_lognormal(self):
+        samples = sorted(self.samples("lognormal:0.2:0.5"))
+
+        self.assertGreater(min(samples), 0)
+        self.assertAlmostEqual(samples[len(samples) // 2], 0.2, delta=0.02)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            LatencyDistribution("normal:1").sample(random.Random(1))
+
+
+class ProjectTests(unittest.TestCase):
+    def test_project(self):
+        data = {"stations": [{"id": "1", "name": "A", "coordinate": {"x": 1, "y": 2}}]}
+
+        self.assertEqual(
+            project(data, ["stations/name", "stations/coordinate/x"]),
+            {"stations": [{"name": "A", "coordinate": {"x": 1}}]},
+        )
+        self.assertIs(project(data, []), data)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+from urllib.parse import parse_qs, urlsplit
+
+import aiohttp
+import requests
+
+from app import utils
+from app.ratelimit import AdaptiveRateLimiter
+from app.services import AsyncTransportService, TransportService
+from app.services.transport import CONNECTION_PROJECTIONS, LOCATION_PROJECTIONS
+from benchmarks.stub_server import StubTransportServer
+
+
+class TransportServiceParseTests(unittest.TestCase):
+    def setUp(self):
+        self.transport_service = TransportService("http://localhost")
+
+    def test_parse_connections_with_nulls(self):
+        data = {
+            "connections": [
+                None,
+                {
+                    "from": {
+                        "station": {"id": "1", "name": "A", "coordinate": None},
+                        "prognosis": None,
+                    },
+                    "to": None,
+                    "service": None,
+                    "sections": [
+                        None,
+                        {"journey": None, "walk": {"duration": None}},
+                    ],
+                },
+            ]
+        }
+
+        connections = self.transport_service.parse_connections(data)
+
+        self.assertEqual(len(connections), 1)
+        connection = connections[0]
+        self.assertEqual(connection._from.station.name, "A")
+        self.assertIsNone(connection._from.station.coordinate.x)
+        self.assertIsNone(connection.to.station.name)
+        self.assertEqual(len(connection.sections), 1)
+        self.assertEqual(connection.sections[0].journey.passList, [])
+
+    def test_same_result_as_clean_nones(self):
+        data = {
+            "stations": [
+                {"id": "1", "name": "A", "score": None, "coordinate": None},
+                None,
+                {"id": None, "name": "B", "distance": 20},
+            ]
+        }
+
+        self.assertEqual(
+            self.transport_service.parse_locations(data),
+            self.transport_service.parse_locations(utils.clean_nones(data)),
+        )
+
+    def test_stations_are_shared_between_stops(self):
+        station = {"id": "8503000", "name": "Zürich HB", "coordinate": {"x": 47.3}}
+        data = {
+            "connections": [
+                {"from": {"station": dict(station)}, "to": {"station": dict(station)}},
+                {"from": {"station": dict(station)}},
+            ]
+        }
+
+        first, second = self.transport_service.parse_connections(data)
+
+        self.assertIs(first._from.station, first.to.station)
+        self.assertIs(first._from.station, second._from.station)
+
+    def test_stations_with_other_fields_are_not_shared(self):
+        data = {
+            "connections": [
+                {"from": {"station": {"id": "1", "name": "A"}}},
+                {"from": {"station": {"id": "1", "name": "A", "type": "station"}}},
+            ]
+        }
+
+        first, second = self.transport_service.parse_connections(data)
+
+        self.assertIsNot(first._from.station, second._from.station)
+        self.assertEqual(second._from.station.type, "station")
+
+    def test_times_are_parsed_at_ingest(self):
+        data = {
+            "connections": [
+                {
+                    "from": {
+                        "departure": "2023-05-01T10:00:00+0200",
+                        "departureTimestamp": 1682928000,
+                    },
+                    # Timestamps missing in a projection are read from the date
+                    "to": {"arrival": "2023-05-01T11:30:00+0200"},
+                    "duration": "00d01:30:00",
+                }
+            ]
+        }
+
+        connection = self.transport_service.parse_connections(data)[0]
+
+        self.assertEqual(connection._from.departureTimestamp, 1682928000)
+        self.assertEqual(connection.to.arrivalTimestamp, 1682933400)
+        self.assertIsNone(connection.to.departureTimestamp)
+        self.assertEqual(connection.duration_seconds, 5400)
+
+
+class TransportServiceProjectionTests(unittest.TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.get.return_value = MagicMock(
+            status_code=200, content=b'{"stations": [], "connections": []}'
+        )
+        self.transport_service = TransportService("http://localhost", self.session)
+
+    def sent_fields(self):
+        """fields[] of the query string the last request was sent with"""
+        url, kwargs = self.session.get.call_args[0][0], self.session.get.call_args[1]
+        prepared = requests.Request("GET", url, params=kwargs["params"]).prepare()
+        return parse_qs(urlsplit(prepared.url).query).get("fields[]")
+
+    def test_location_fields(self):
+        self.transport_service.search_locations(
+            x=47.0, y=8.0, projection="routing-probe"
+        )
+
+        self.assertEqual(
+            self.sent_fields(),
+            [
+                "stations/id",
+                "stations/name",
+                "stations/type",
+                "stations/coordinate",
+                "stations/distance",
+            ],
+        )
+        self.assertEqual(self.sent_fields(), LOCATION_PROJECTIONS["routing-probe"])
+
+    def test_connection_fields(self):
+        self.transport_service.get_connections("A", "B", projection="routing-probe")
+
+        fields = self.sent_fields()
+        self.assertEqual(fields, CONNECTION_PROJECTIONS["routing-probe"])
+        # Routing and the details lookup match connections by these
+        self.assertIn("connections/from/departureTimestamp", fields)
+        self.assertIn("connections/to/arrivalTimestamp", fields)
+        self.assertNotIn("connections/sections", fields)
+
+    def test_complete_objects_without_projection(self):
+        for projection in [None, "detail"]:
+            self.transport_service.get_connections("A", "B", projection=projection)
+            self.assertIsNone(self.sent_fields())
+
+            self.transport_service.search_locations("A", projection=projection)
+            self.assertIsNone(self.sent_fields())
+
+
+class TransportServiceStatusTests(unittest.TestCase):
+    def serve(self, **kwargs):
+        server = StubTransportServer(("127.0.0.1", 0), **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    def test_error_responses_raise(self):
+        for kwargs, status in [({"throttle_rate": 1}, 429), ({"error_rate": 1}, 500)]:
+            limiter = AdaptiveRateLimiter(initial_concurrency=4)
+            transport_service = TransportService(self.serve(**kwargs), limiter=limiter)
+
+            with self.assertRaises(requests.HTTPError) as raised:
+                transport_service.get_connections("A", "B")
+            with self.assertRaises(requests.HTTPError):
+                transport_service.search_locations("A")
+
+            self.assertEqual(raised.exception.response.status_code, status)
+            # The limiter still saw the status
+            self.assertLess(limiter.stats()["concurrency_limit"], 4)
+
+    def test_async_error_responses_raise(self):
+        for kwargs, status in [({"throttle_rate": 1}, 429), ({"error_rate": 1}, 500)]:
+            transport_service = AsyncTransportService(self.serve(**kwargs))
+
+            async def get_connections():
+                try:
+                    return await transport_service.get_connections_async("A", "B")
+                finally:
+                    await transport_service.close()
+
+            with self.assertRaises(aiohttp.ClientResponseError) as raised:
+                asyncio.run(get_connections())
+
+            self.assertEqual(raised.exception.status, status)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+""" TransportApp """
+
+__author__ = "Aghrabi Carim, Zambelli Adrian, Schmid Aaron"
+__version__ = "1.0.0"
+
+import unittest
+from unittest.mock import patch
+
+from app import utils
+
+
+class TimeFormattingTests(unittest.TestCase):
+    def test_parse_duration_seconds(self):
+        self.assertEqual(utils.parse_duration_seconds("00d01:23:05"), 4985)
+        self.assertEqual(utils.parse_duration_seconds("01d00:00:00"), 86400)
+        self.assertIsNone(utils.parse_duration_seconds(None))
+
+    def test_format_duration(self):
+        self.assertEqual(utils.format_duration(4985), "1h 23min 5s")
+        self.assertEqual(utils.format_duration(None), "")
+        self.assertEqual(utils.parse_duration("00d00:45:00"), "45min")
+
+    def test_format_timestamp_like_prase_date(self):
+        for date in ("2023-05-01T10:00:00+0200", "2023-01-15T23:59:00+0100"):
+            self.assertEqual(
+                utils.format_timestamp(utils.parse_timestamp(date)),
+                utils.prase_date(date),
+            )
+        self.assertEqual(utils.format_timestamp(None), "")
+
+    def test_format_timestamp_without_tz_database(self):
+        dates = [
+            "2023-01-15T23:59:00+0100",
+            "2023-03-26T01:59:00+0100",
+            "2023-03-26T03:00:00+0200",
+            "2023-10-29T02:59:00+0200",
+            "2023-10-29T02:00:00+0100",
+        ]
+        utils.format_timestamp.cache_clear()
+        try:
+            with patch.object(utils, "TIMEZONE", None):
+                for date in dates:
+                    self.assertEqual(
+                        utils.format_timestamp(utils.parse_timestamp(date)),
+                        utils.prase_date(date),
+                    )
+        finally:
+            utils.format_timestamp.cache_clear()
+
+
+class SelectorKeyTests(unittest.TestCase):
+    def test_bool_key(self):
+        for value in ["true", "True", "yes", "1", " on ", True]:
+            self.assertEqual(utils.bool_key(value), "true")
+        for value in ["false", "False", "no", "0", "off", "", False]:
+            self.assertEqual(utils.bool_key(value), "false")
+
+    def test_choice_key(self):
+        self.assertEqual(utils.choice_key(" Replay "), "replay")